@@ -1,40 +1,357 @@
 import pandas as pd
 import streamlit as st
 import plotly.express as px
+import plotly.graph_objects as go
+from constants.chart_constants import (
+    MAX_GRAFICOS_EN_CACHE, UMBRAL_GRAN_VOLUMEN, PUNTOS_POR_SERIE, CELDAS_DENSIDAD,
+    MAX_BINS_HISTOGRAMA, MAX_ATIPICOS_POR_CAJA, PARAMETRO_GRAFICO, MAX_LONGITUD_ENLACE, TIPOS_GRAFICO,
+    COLOR_PALETTES, AGGREGATION_METHODS, BARMODE_DICT,
+)
 from utils.chart_config import get_chart_config
+from utils.chart_summary import resumen_histograma, resumen_cajas
+from utils.chart_url import codificar_spec, decodificar_spec
+from utils.column_profile import perfil_columna
+from utils.downsampling import reducir_lineas, reducir_dispersion
+from utils.figure_cache import CacheLRU, huella_datos
+from utils.filter_engine import filtrar
 chart_config = get_chart_config()
 
 def es_numerica(col, df):
-    """Verifica si una columna es numérica."""
+    """Verifica si una columna es numérica (las de sí/no se tratan como categóricas)."""
     try:
-        return pd.api.types.is_numeric_dtype(df[col])
+        return perfil_columna(df, col).numerica
     except KeyError:
         return False
 
-def aplicar_filtros(df, key_suffix=""):
-    """Aplica filtros dinámicos al DataFrame."""
-    df_filtrado = df.copy()
+def seleccion_filtros(df, clave_columnas, prefijo="", key_suffix=""):
+    """
+    Widgets de filtros dinámicos: devuelve la selección como [(columna, tipo, selección)],
+    con ('rango', (min, max)) para columnas numéricas y ('valores', valores) para el resto.
+    Límites y opciones salen del perfil de cada columna, que se calcula una vez por versión.
+    """
+    filtros = []
     with st.expander("Filtros de Datos (Opcional)", expanded=False):
-        columnas_filtro = st.multiselect("Selecciona columnas para filtrar", df.columns, key=f"aplicar_filtros_columnas_{key_suffix}")
+        columnas_filtro = st.multiselect("Selecciona columnas para filtrar", df.columns, key=clave_columnas)
         for i, col in enumerate(columnas_filtro):
-            if es_numerica(col, df):
+            perfil = perfil_columna(df, col)
+            if perfil.numerica:
+                clave = f"{prefijo}rango_{col}_{i}_{key_suffix}"
                 rango = st.slider(
                     f"Rango para {col}",
-                    float(df[col].min()),
-                    float(df[col].max()),
-                    (float(df[col].min()), float(df[col].max())),
-                    key=f"aplicar_filtros_rango_{col}_{i}_{key_suffix}"
+                    perfil.minimo,
+                    perfil.maximo,
+                    # Sin valor por defecto si ya viene en la sesión (p. ej. desde un enlace)
+                    None if clave in st.session_state else (perfil.minimo, perfil.maximo),
+                    key=clave
                 )
-                df_filtrado = df_filtrado[(df_filtrado[col] >= rango[0]) & (df_filtrado[col] <= rango[1])]
+                filtros.append((col, 'rango', tuple(rango)))
             else:
-                valores = df[col].dropna().unique().tolist()
-                seleccionados = st.multiselect(f"Valores para {col}", valores, default=valores, key=f"aplicar_filtros_valores_{col}_{i}_{key_suffix}")
-                df_filtrado = df_filtrado[df_filtrado[col].isin(seleccionados)]
-    return df_filtrado
+                valores = perfil.valores
+                clave = f"{prefijo}valores_{col}_{i}_{key_suffix}"
+                seleccionados = st.multiselect(
+                    f"Valores para {col}", valores, default=None if clave in st.session_state else valores,
+                    format_func=lambda valor, perfil=perfil: f"{valor} ({perfil.conteo(valor)})",
+                    help=f"{perfil.nulos} respuestas vacías" if perfil.nulos else None,
+                    key=clave
+                )
+                filtros.append((col, 'valores', tuple(sorted(seleccionados, key=str))))
+    return filtros
+
+def aplicar_filtros(df, key_suffix=""):
+    """Aplica filtros dinámicos al DataFrame (una sola máscara combinada, sin copias)."""
+    filtros = seleccion_filtros(df, f"aplicar_filtros_columnas_{key_suffix}", "aplicar_filtros_", key_suffix)
+    return filtrar(df, filtros)
+
+# Gráficos ya construidos: especificación normalizada + huella de los datos -> (df_plot, figura)
+_graficos = CacheLRU(MAX_GRAFICOS_EN_CACHE)
+
+def _reducir(df_plot, spec):
+    """
+    Modo de gran volumen: por encima de UMBRAL_GRAN_VOLUMEN filas cada serie de línea se
+    reduce con LTTB y la dispersión se agrega en celdas de densidad. El número de filas
+    originales queda en attrs['filas_originales'] para avisar que la vista está agregada
+    (solo si de verdad se descartaron filas).
+    """
+    if not spec['reducir'] or len(df_plot) <= UMBRAL_GRAN_VOLUMEN:
+        return df_plot
+    grupos = [col for col in (spec['color'], spec['facet_col'], spec['facet_row']) if col is not None]
+    if spec['tipo'] == "Línea":
+        reducido = reducir_lineas(df_plot, spec['x'], spec['y'], grupos, PUNTOS_POR_SERIE)
+    else:
+        reducido = reducir_dispersion(df_plot, spec['x'], spec['y'], grupos, CELDAS_DENSIDAD)
+    if len(reducido) < len(df_plot):
+        # Un eje X categórico no se reduce: en ese caso no hay vista agregada que avisar
+        reducido.attrs['filas_originales'] = len(df_plot)
+    return reducido
+
+
+def _datos_grafico(df, spec):
+    """DataFrame que se grafica: filtrado y, en barras, agregado (y en frecuencia relativa)."""
+    df_plot = filtrar(df, spec['filtros'])
+    if spec['tipo'] in ["Dispersión", "Línea"]:
+        return _reducir(df_plot, spec)
+    if spec['tipo'] != "Barras":
+        return df_plot
+    df_plot = pd.pivot_table(df_plot, values=spec['y'], index=list(spec['indices']), aggfunc=spec['agregacion'], observed=True).reset_index()
+    columna_total = spec['frecuencia']
+    if columna_total is not None and spec['y'] in df_plot.columns:
+        if columna_total[0] == "Total":
+            total = df_plot[spec['y']].sum()
+            df_plot["Frecuencia"] = df_plot[spec['y']] / total
+        else:
+            total = df_plot.pivot_table(index=list(columna_total),
+                                        values=spec['y'],
+                                        aggfunc='sum').rename(columns={spec['y']: "TOTAL"}).reset_index()
+            df_plot = df_plot.merge(total, on=list(columna_total))
+            df_plot["Frecuencia"] = df_plot[spec['y']] / df_plot["TOTAL"]
+    return df_plot
+
+
+def _grupos(spec):
+    """Columnas que separan series en el gráfico: color y facetas."""
+    return [col for col in (spec['color'], spec['facet_col'], spec['facet_row']) if col is not None]
+
+
+def _figura_histograma(df_plot, spec, comunes, category_order):
+    """
+    Histograma con los conteos calculados en el servidor (por grupo de color y faceta):
+    el navegador recibe una barra por intervalo, no cada respuesta.
+    """
+    conteos = resumen_histograma(df_plot, spec['x'], _grupos(spec), MAX_BINS_HISTOGRAMA)
+    fig = px.bar(conteos, x=spec['x'], y='Cuenta', barmode=BARMODE_DICT[spec['barmode']], category_orders=category_order, **comunes)
+    if 'Ancho' in conteos.columns:
+        # Intervalos contiguos, como en un histograma
+        fig.update_layout(bargap=0)
+    return fig
+
+
+def _figura_cajas(df_plot, spec, comunes, category_order):
+    """
+    Diagrama de cajas con cuartiles, bigotes y atípicos calculados en el servidor: cada
+    caja viaja como cinco números (más sus atípicos, acotados) en lugar de todas sus filas.
+    Plotly Express arma las trazas y facetas sobre la tabla de cajas; luego cada traza
+    recibe sus estadísticos precalculados.
+    """
+    col_y = spec['y']
+    cajas, atipicos = resumen_cajas(df_plot, spec['x'], col_y, _grupos(spec), MAX_ATIPICOS_POR_CAJA)
+    fig = px.box(cajas, x=spec['x'], y='mediana', custom_data=['Caja'], category_orders=category_order,
+                 labels={'mediana': col_y}, **comunes)
+    trazas_atipicos = []
+    for traza in list(fig.data):
+        filas = cajas.iloc[traza.customdata[:, 0].astype(int)]
+        traza.update(
+            y=None, customdata=None, boxpoints=False,
+            q1=filas['q1'], median=filas['mediana'], q3=filas['q3'],
+            lowerfence=filas['inferior'], upperfence=filas['superior'],
+        )
+        fuera = atipicos[atipicos['Caja'].isin(filas['Caja'])]
+        if not fuera.empty:
+            trazas_atipicos.append(go.Scatter(
+                x=fuera[spec['x']], y=fuera[col_y], mode='markers', name=traza.name,
+                xaxis=traza.xaxis, yaxis=traza.yaxis, offsetgroup=traza.offsetgroup,
+                legendgroup=traza.legendgroup, showlegend=False, marker=dict(color=traza.marker.color),
+            ))
+    fig.add_traces(trazas_atipicos)
+    fig.update_layout(scattermode='group')
+    return fig
+
+
+def _figura(df_plot, spec):
+    """Figura de Plotly Express para los datos ya preparados."""
+    col_x, col_y, chart_type = spec['x'], spec['y'], spec['tipo']
+    title = f"{chart_type}: {col_x} vs {col_y}"
+    comunes = dict(
+        color=spec['color'],
+        title=title,
+        color_discrete_sequence=COLOR_PALETTES[spec['paleta']],
+        facet_col=spec['facet_col'],
+        facet_row=spec['facet_row'],
+    )
+    category_order = {col_x: list(spec['orden'])} if spec['orden'] is not None else {}
+
+    if chart_type == "Barras":
+        orientation = spec['orientacion']
+        if spec['frecuencia'] is not None:
+            fig = px.bar(
+                df_plot,
+                x=col_x if orientation == 'v' else "Frecuencia",
+                y="Frecuencia" if orientation == 'v' else col_x,
+                barmode=BARMODE_DICT[spec['barmode']],
+                category_orders=category_order,
+                orientation=orientation,
+                text="Frecuencia",
+                **comunes
+            )
+            fig.update_traces(texttemplate='%{text:.2%}', textposition='outside')
+            fig.update_layout(yaxis_tickformat=',.0%' if orientation == 'v' else None,
+                            xaxis_tickformat=',.0%' if orientation == 'h' else None)
+        else:
+            # Crear gráfico de barras absoluto
+            fig = px.bar(
+                df_plot,
+                x=col_x if orientation == 'v' else col_y,
+                y=col_y if orientation == 'v' else col_x,
+                barmode=BARMODE_DICT[spec['barmode']],
+                category_orders=category_order,
+                orientation=orientation,
+                **comunes
+            )
+    elif chart_type == "Dispersión":
+        render_mode = 'webgl' if len(df_plot) > UMBRAL_GRAN_VOLUMEN or 'Puntos' in df_plot.columns else 'auto'
+        if 'Puntos' in df_plot.columns:
+            # Celdas de densidad: el tamaño de cada punto indica cuántas respuestas resume
+            fig = px.scatter(df_plot, x=col_x, y=col_y, size='Puntos', hover_data=['Puntos'], render_mode=render_mode, **comunes)
+        else:
+            fig = px.scatter(df_plot, x=col_x, y=col_y, render_mode=render_mode, **comunes)
+    elif chart_type == "Cajas":
+        fig = _figura_cajas(df_plot, spec, comunes, category_order)
+    elif chart_type == "Línea":
+        render_mode = 'webgl' if len(df_plot) > UMBRAL_GRAN_VOLUMEN or 'filas_originales' in df_plot.attrs else 'auto'
+        fig = px.line(df_plot, x=col_x, y=col_y, render_mode=render_mode, **comunes)
+    elif chart_type == "Histograma":
+        fig = _figura_histograma(df_plot, spec, comunes, category_order)
+    return fig
+
+
+def clave_grafico(df, spec):
+    """Clave de la caché de gráficos: especificación normalizada + huella de los datos (None sin versión)."""
+    huella = huella_datos(df)
+    if huella is None:
+        return None
+    return huella, tuple(sorted(spec.items()))
+
+
+def construir_grafico(df, spec):
+    """
+    Devuelve (df_plot, figura) para una especificación del graficador. Con datos
+    versionados el resultado se guarda en una caché LRU compartida, así que volver a
+    una especificación ya vista (en esta u otra sesión) no recalcula nada.
+    """
+    def construir():
+        df_plot = _datos_grafico(df, spec)
+        return df_plot, _figura(df_plot, spec)
+
+    clave = clave_grafico(df, spec)
+    if clave is None:
+        return construir()
+    return _graficos.obtener(clave, construir)
+
+
+def _parametro_url(key_suffix):
+    """Parámetro de la URL donde el graficador con este sufijo guarda su especificación."""
+    return f"{PARAMETRO_GRAFICO}_{key_suffix}" if key_suffix else PARAMETRO_GRAFICO
+
+
+def spec_enlace(df, spec):
+    """
+    Especificación que se guarda en la URL: sin lo que coincide con el valor por defecto
+    de los widgets (el orden de categorías original, filtros que no descartan nada), y
+    cada filtro de valores como los valores elegidos o los excluidos ('excluir'), lo que
+    sea más corto. Así el enlace no crece con el número de valores distintos de una columna.
+    """
+    filtros = []
+    for col, tipo, seleccion in spec['filtros']:
+        perfil = perfil_columna(df, col)
+        if tipo == 'rango' and seleccion == (perfil.minimo, perfil.maximo):
+            continue
+        if tipo == 'valores':
+            elegidos = set(seleccion)
+            excluidos = tuple(valor for valor in perfil.valores if valor not in elegidos)
+            if not excluidos:
+                continue
+            if len(excluidos) < len(seleccion):
+                filtros.append((col, 'excluir', excluidos))
+                continue
+        filtros.append((col, tipo, seleccion))
+    orden = spec['orden']
+    if orden is not None and list(orden) == perfil_columna(df, spec['x']).valores:
+        orden = None
+    return {**spec, 'filtros': tuple(filtros), 'orden': orden}
+
+
+def _estado_widgets(df, spec, key_suffix):
+    """
+    Valores de los widgets del graficador que reproducen una especificación leída de la URL.
+    Un campo ausente deja el widget con su valor por defecto, igual que los que no aplican
+    a estos datos (columnas u opciones que ya no existen).
+    """
+    columnas = df.columns.tolist()
+    tipo = spec.get('tipo')
+    estado = {}
+    if tipo in TIPOS_GRAFICO:
+        estado[f"chart_type_{key_suffix}"] = tipo
+    for campo, clave in (('x', 'col_x'), ('y', 'col_y')):
+        if spec.get(campo) in columnas:
+            estado[f"{clave}_{key_suffix}"] = spec[campo]
+    for campo, clave in (('facet_col', 'facet_col'), ('facet_row', 'facet_row'), ('color', 'col_color')):
+        valor = spec.get(campo)
+        if valor is None or (valor in columnas and valor != spec.get('y')):
+            estado[f"{clave}_{key_suffix}"] = "Ninguna" if valor is None else valor
+
+    filtros = [filtro for filtro in spec.get('filtros', []) if len(filtro) == 3 and filtro[0] in columnas]
+    estado[f"columnas_filtro_{key_suffix}"] = [col for col, _, _ in filtros]
+    for i, (col, tipo_filtro, seleccion) in enumerate(filtros):
+        perfil = perfil_columna(df, col)
+        if tipo_filtro == 'rango' and perfil.numerica and perfil.minimo is not None and len(seleccion) == 2:
+            estado[f"rango_{col}_{i}_{key_suffix}"] = (
+                min(max(float(seleccion[0]), perfil.minimo), perfil.maximo),
+                max(min(float(seleccion[1]), perfil.maximo), perfil.minimo),
+            )
+        elif tipo_filtro == 'valores' and not perfil.numerica:
+            estado[f"valores_{col}_{i}_{key_suffix}"] = [valor for valor in seleccion if valor in perfil.conteos]
+        elif tipo_filtro == 'excluir' and not perfil.numerica:
+            excluidos = set(seleccion)
+            estado[f"valores_{col}_{i}_{key_suffix}"] = [valor for valor in perfil.valores if valor not in excluidos]
+
+    if tipo == "Barras":
+        metodos = {funcion: metodo for metodo, funcion in AGGREGATION_METHODS.items()}
+        if spec.get('agregacion') in metodos and (spec['agregacion'] not in ("mean", "sum") or es_numerica(spec.get('y'), df)):
+            estado[f"metodo_agregacion_{key_suffix}"] = metodos[spec['agregacion']]
+        if spec.get('barmode') in BARMODE_DICT:
+            estado[f"barmode_barras_{key_suffix}"] = spec['barmode']
+        estado[f"horizontal_{key_suffix}"] = spec.get('orientacion') == 'h'
+        frecuencia = spec.get('frecuencia')
+        estado[f"frecuencia_relativa_{key_suffix}"] = bool(frecuencia)
+        if frecuencia:
+            opciones = ["Total"] + list(spec.get('indices') or [])
+            estado[f"relativo_a_{key_suffix}"] = [col for col in frecuencia if col in opciones]
+    elif tipo == "Histograma" and spec.get('barmode') in ["grupo", "superpuesto", "relativo"]:
+        estado[f"barmode_{key_suffix}"] = spec['barmode']
+    elif tipo in ["Dispersión", "Línea"]:
+        estado[f"sin_reducir_{key_suffix}"] = not spec.get('reducir', True)
+
+    if spec.get('paleta') in COLOR_PALETTES:
+        estado[f"paleta_{key_suffix}"] = spec['paleta']
+    if spec.get('orden') is not None and spec.get('x') in columnas:
+        valores = perfil_columna(df, spec['x']).conteos
+        estado[f"orden_categorias_{key_suffix}"] = [valor for valor in spec['orden'] if valor in valores]
+    return estado
+
+
+def restaurar_desde_url(df, key_suffix=""):
+    """
+    La primera vez que la sesión abre el graficador, pone sus widgets en el gráfico
+    guardado en la URL (si lo hay). Un enlace dañado solo muestra un aviso.
+    """
+    bandera = f"url_restaurada_{key_suffix}"
+    if st.session_state.get(bandera):
+        return
+    st.session_state[bandera] = True
+    texto = st.query_params.get(_parametro_url(key_suffix))
+    if not texto:
+        return
+    try:
+        st.session_state.update(_estado_widgets(df, decodificar_spec(texto), key_suffix))
+    except (ValueError, TypeError):
+        st.warning("El enlace no contiene un gráfico válido: se muestra la configuración por defecto.")
+
 
 def graficador (df, key_suffix=""):
+    # Gráfico compartido por enlace: se restaura antes de crear los widgets
+    restaurar_desde_url(df, key_suffix)
+
     # Selección del tipo de gráfico
-    chart_type = st.radio("Tipo de Gráfico", ["Barras", "Dispersión", "Cajas", "Línea", "Histograma"], key=f"chart_type_{key_suffix}")
+    chart_type = st.radio("Tipo de Gráfico", TIPOS_GRAFICO, key=f"chart_type_{key_suffix}")
 
     # Selección de categoría y columna para el eje X
     col_x = st.selectbox("Selecciona una columna para el eje X", df.columns, key=f"col_x_{key_suffix}")
@@ -60,25 +377,8 @@ def graficador (df, key_suffix=""):
         col_color = st.selectbox("Agrupar por color (opcional)", ["Ninguna"] + [col for col in df.columns if col != col_y], key=f"col_color_{key_suffix}")
 
 
-    def es_numerica(col, df):
-        try:
-            return pd.api.types.is_numeric_dtype(df[col])
-        except KeyError:
-            return False
-
     # --- Filtros dinámicos ---
-    df_filtrado = df.copy()
-
-    with st.expander("Filtros de Datos (Opcional)", expanded=False):
-        columnas_filtro = st.multiselect("Selecciona columnas para filtrar", df.columns, key=f"columnas_filtro_{key_suffix}")
-        for i, col in enumerate(columnas_filtro):
-            if es_numerica(col, df):
-                rango = st.slider(f"Rango para {col}", float(df[col].min()), float(df[col].max()), (float(df[col].min()), float(df[col].max())), key=f"rango_{col}_{i}_{key_suffix}")
-                df_filtrado = df_filtrado[(df_filtrado[col] >= rango[0]) & (df_filtrado[col] <= rango[1])]
-            else:
-                valores = df[col].dropna().unique().tolist()
-                seleccionados = st.multiselect(f"Valores para {col}", valores, default=valores, key=f"valores_{col}_{i}_{key_suffix}")
-                df_filtrado = df_filtrado[df_filtrado[col].isin(seleccionados)]
+    filtros = seleccion_filtros(df, f"columnas_filtro_{key_suffix}", key_suffix=key_suffix)
 
 
     # Validación extra de variable Y para gráficos numéricos
@@ -87,8 +387,30 @@ def graficador (df, key_suffix=""):
             st.warning(f"La variable Y '{col_y}' debería ser numérica para el gráfico seleccionado.")
             st.stop()
 
-    # --- Preparar datos para gráficos ---
-    df_plot = df_filtrado.copy()
+    # --- Especificación del gráfico (todo lo que determina los datos y la figura) ---
+    spec = {
+        'tipo': chart_type,
+        'x': col_x,
+        'y': col_y,
+        'facet_col': None if facet_col == "Ninguna" else facet_col,
+        'facet_row': None if facet_row == "Ninguna" else facet_row,
+        'color': None if col_color == "Ninguna" else col_color,
+        'filtros': tuple(filtros),
+        'indices': None,
+        'agregacion': None,
+        'barmode': None,
+        'orientacion': None,
+        'frecuencia': None,
+        'orden': None,
+        'reducir': False,
+    }
+
+    if chart_type in ["Dispersión", "Línea"] and len(df) > UMBRAL_GRAN_VOLUMEN:
+        spec['reducir'] = not st.checkbox(
+            "Mostrar todos los puntos (sin agregar)",
+            key=f"sin_reducir_{key_suffix}",
+            help=f"Con más de {UMBRAL_GRAN_VOLUMEN:,} filas el gráfico se agrega en el servidor para que cargue rápido.",
+        )
 
     if chart_type == "Barras":
         opciones_agregacion = ["Cuenta",  "Cuenta de únicos"]
@@ -96,176 +418,83 @@ def graficador (df, key_suffix=""):
             opciones_agregacion.insert(1, "Promedio")  # Solo agregar 'Promedio' si es numérica
             opciones_agregacion.insert(2, "Suma" ) 
         metodo_agregacion = st.selectbox("Método de agregación", opciones_agregacion, key=f"metodo_agregacion_{key_suffix}")
-        aggfunc = {"Promedio": "mean","Suma": "sum", "Cuenta": "count", "Cuenta de únicos": "nunique"}[metodo_agregacion]
+        spec['agregacion'] = AGGREGATION_METHODS[metodo_agregacion]
         indices=[facet_col,facet_row, col_color, col_x]#contiene todos los datos de los filtros que no sea ninguna ni eje y
         indices=set(indices).difference(set(["Ninguna"]))#elimina los valores de ninguna
-        indices=list(indices)
-        df_plot = pd.pivot_table(df_filtrado, values=col_y, index=indices, aggfunc=aggfunc).reset_index()
-
-
-        # Verificar que las columnas seleccionadas existen en el DataFrame después de pivot_table
-        if col_y not in df_plot.columns:
-            st.error(f"La columna '{col_y}' no se encuentra en los datos después de aplicar pivot_table. Por favor, selecciona otra columna.")
-            st.stop()
+        indices=sorted(indices)
+        spec['indices'] = tuple(indices)
 
         # Selección del tipo de barra (barmode)
-        barmode = st.selectbox("Tipo de barra", ["grupo", "apilado", "superpuesto", "relativo"])
-        barmode_dict = {"grupo": "group", "apilado": "stack", "superpuesto": "overlay", "relativo": "relative"}
-        if st.checkbox("Ver barras horizontales"):
-            orientation = 'h'
-            invertir = True
-        else:
-            orientation = 'v'
-            invertir = False
+        spec['barmode'] = st.selectbox("Tipo de barra", ["grupo", "apilado", "superpuesto", "relativo"], key=f"barmode_barras_{key_suffix}")
+        spec['orientacion'] = 'h' if st.checkbox("Ver barras horizontales", key=f"horizontal_{key_suffix}") else 'v'
         
-        if st.checkbox("Visualizar frecuencia relativa"):
-            columna_total = st.multiselect("Relativo respecto a:", ["Total"] + indices)
+        if st.checkbox("Visualizar frecuencia relativa", key=f"frecuencia_relativa_{key_suffix}"):
+            columna_total = st.multiselect("Relativo respecto a:", ["Total"] + indices, key=f"relativo_a_{key_suffix}")
             if len(columna_total) == 0:
                 st.warning("Por favor, selecciona una columna para calcular la frecuencia relativa.")
                 st.stop()
             if len(columna_total) > 1 and "Total" in columna_total:
                 st.warning("Selección errónea. Si desea ver el porcentaje respecto al Total, elimine los demás valores seleccionados, de lo contrario, elimine 'Total' para elegir una combinación personalizada")
                 st.stop()
-            if columna_total[0] == "Total":
-                total = df_plot[col_y].sum()
-                df_plot["Frecuencia"] = df_plot[col_y] / total
-            elif columna_total == "Preguntas":
-                arreglo_indices = [columna_total]
-                if facet_row is not None:
-                    arreglo_indices.append(facet_row)
-                if facet_col is not None:
-                    arreglo_indices.append(facet_col)
-                total = df_plot.pivot_table(index=list(set(arreglo_indices)),
-                                            values=col_y,
-                                            aggfunc='sum').rename(columns={col_y: "TOTAL"}).reset_index()
-                df_plot = df_plot.merge(total, on=list(set(arreglo_indices)))
-                df_plot["Frecuencia"] = df_plot[col_y] / df_plot["TOTAL"]
-            else:
-                total = df_plot.pivot_table(index=columna_total,
-                                            values=col_y,
-                                            aggfunc='sum').rename(columns={col_y: "TOTAL"}).reset_index()
-                df_plot = df_plot.merge(total, on=columna_total)
-                df_plot["Frecuencia"] = df_plot[col_y] / df_plot["TOTAL"]
-            visualizarFrecuencia=True
-        else:
-            visualizarFrecuencia=False
+            spec['frecuencia'] = tuple(columna_total)
 
     # Selección de colores
-    color_palettes = {
-        "Plotly": px.colors.qualitative.Plotly,
-        "Viridis": px.colors.sequential.Viridis,
-        "Cividis": px.colors.sequential.Cividis,
-        "Inferno": px.colors.sequential.Inferno,
-        "Magma": px.colors.sequential.Magma,
-        "Plasma": px.colors.sequential.Plasma,
-        "Turbo": px.colors.sequential.Turbo,
-        "G10": px.colors.qualitative.G10,
-        "T10": px.colors.qualitative.T10,
-        "Alphabet": px.colors.qualitative.Alphabet,
-        "Dark24": px.colors.qualitative.Dark24,
-        "Light24": px.colors.qualitative.Light24,
-        "Set1": px.colors.qualitative.Set1,
-        "Pastel1": px.colors.qualitative.Pastel1,
-        "Set2": px.colors.qualitative.Set2,
-        "Pastel2": px.colors.qualitative.Pastel2,
-        "Set3": px.colors.qualitative.Set3,
-        "Antique": px.colors.qualitative.Antique,
-        "Bold": px.colors.qualitative.Bold,
-        "D3": px.colors.qualitative.D3,
-        "Prism": px.colors.qualitative.Prism,
-        "Safe": px.colors.qualitative.Safe,
-        "Vivid": px.colors.qualitative.Vivid
-    }
-
-    color_palette = st.selectbox("Paleta de colores", list(color_palettes.keys()))
-    color_sequence = color_palettes[color_palette]
-
-    category_order = {}
+    spec['paleta'] = st.selectbox("Paleta de colores", list(COLOR_PALETTES.keys()), key=f"paleta_{key_suffix}")
 
     if chart_type in ["Barras", "Cajas", "Histograma"]:
-        valores_unicos = df[col_x].dropna().unique().tolist()
+        valores_unicos = perfil_columna(df, col_x).valores
         with st.expander("Orden de categorías (Opcional)", expanded=False):
-            category_order[col_x] = st.multiselect("Ordena las categorías", options=valores_unicos, default=valores_unicos)
-
+            clave_orden = f"orden_categorias_{key_suffix}"
+            spec['orden'] = tuple(st.multiselect(
+                "Ordena las categorías", options=valores_unicos,
+                default=None if clave_orden in st.session_state else valores_unicos, key=clave_orden
+            ))
 
+    # Los avisos y la vista previa van aquí, aunque se llenan después de construir el gráfico
+    avisos = st.container()
 
-    if df_plot.empty:
-        st.warning("No hay datos disponibles después de aplicar los filtros. Ajusta los filtros.")
-
-    # Verificar que las columnas seleccionadas existen en el DataFrame
-    if col_y not in df_plot.columns:
-        st.error(f"La columna '{col_y}' no se encuentra en los datos filtrados. Por favor, selecciona otra columna.")
-
-    with st.expander("Vista previa de datos filtrados", expanded=False):
-        st.dataframe(df_plot.dropna().head(1000))
-
-    title = f"{chart_type}: {col_x} vs {col_y}"
-    color_param = None if col_color == "Ninguna" else col_color
-    if col_color == "Ninguna":
-        col_color = None
+    if chart_type == "Histograma":
+        # Selección del tipo de barra (barmode) para histograma
+        spec['barmode'] = st.selectbox("Tipo de barra", ["grupo", "superpuesto", "relativo"], key=f"barmode_{key_suffix}")
+
+    # La URL guarda la especificación: quien abra el enlace ve este mismo gráfico, y la
+    # figura sale de la caché compartida si alguien ya lo abrió
+    parametro = _parametro_url(key_suffix)
+    enlace = codificar_spec(spec_enlace(df, spec))
+    compartible = len(enlace) <= MAX_LONGITUD_ENLACE
+    if compartible:
+        st.query_params[parametro] = enlace
+    elif parametro in st.query_params:
+        # Un enlace viejo mostraría otro gráfico
+        del st.query_params[parametro]
+
+    df_plot, fig = construir_grafico(df, spec)
+
+    with avisos:
+        # Verificar que las columnas seleccionadas existen en el DataFrame después de pivot_table
+        if chart_type == "Barras" and col_y not in df_plot.columns:
+            st.error(f"La columna '{col_y}' no se encuentra en los datos después de aplicar pivot_table. Por favor, selecciona otra columna.")
+            st.stop()
 
-    # Configuración de facetas
-    facet_col_param = None if facet_col == "Ninguna" else facet_col
-    facet_row_param = None if facet_row == "Ninguna" else facet_row
+        if df_plot.empty:
+            st.warning("No hay datos disponibles después de aplicar los filtros. Ajusta los filtros.")
 
-    if chart_type == "Barras":
-        if visualizarFrecuencia:
-            fig = px.bar(
-                df_plot,
-                x=col_x if orientation == 'v' else "Frecuencia",
-                y="Frecuencia" if orientation == 'v' else col_x,
-                color=col_color,
-                title=title,
-                barmode=barmode_dict[barmode],
-                color_discrete_sequence=color_sequence,
-                facet_col=facet_col_param,
-                facet_row=facet_row_param,
-                category_orders=category_order,
-                orientation=orientation,
-                text="Frecuencia"
-            )
-            fig.update_traces(texttemplate='%{text:.2%}', textposition='outside')
-            fig.update_layout(yaxis_tickformat=',.0%' if orientation == 'v' else None,
-                            xaxis_tickformat=',.0%' if orientation == 'h' else None)
-        else:
-            # Crear gráfico de barras absoluto
-            fig = px.bar(
-                df_plot,
-                x=col_x if orientation == 'v' else col_y,
-                y=col_y if orientation == 'v' else col_x,
-                color=col_color,
-                title=title,
-                barmode=barmode_dict[barmode],
-                color_discrete_sequence=color_sequence,
-                facet_col=facet_col_param,
-                facet_row=facet_row_param,
-                category_orders=category_order,
-                orientation=orientation
+        if 'filas_originales' in df_plot.attrs:
+            resumen = "reducidas por serie con LTTB" if chart_type == "Línea" else "agrupadas en celdas de densidad"
+            st.info(
+                f"📉 Vista agregada: {df_plot.attrs['filas_originales']:,} filas {resumen} "
+                f"({len(df_plot):,} puntos). Marca 'Mostrar todos los puntos' para ver los datos completos."
             )
-        # fig = px.bar(
-        #     df_plot,
-        #     x=col_x if orientation == 'v' else col_y,
-        #     y=col_y if orientation == 'v' else col_x,
-        #     color=col_color,
-        #     title=title,
-        #     barmode=barmode_dict[barmode],
-        #     color_discrete_sequence=color_sequence,
-        #     facet_col=facet_col_param,
-        #     facet_row=facet_row_param,
-        #     category_orders=category_order,
-        #     orientation=orientation
-        # )
 
-    elif chart_type == "Dispersión":
-        fig = px.scatter(df_plot, x=col_x, y=col_y, color=color_param, title=title, color_discrete_sequence=color_sequence, facet_col=facet_col_param, facet_row=facet_row_param)
-    elif chart_type == "Cajas":
-        fig = px.box(df_plot, x=col_x, y=col_y, color=color_param, title=title, color_discrete_sequence=color_sequence, facet_col=facet_col_param, facet_row=facet_row_param,category_orders=category_order)
-    elif chart_type == "Línea":
-        fig = px.line(df_plot, x=col_x, y=col_y, color=color_param, title=title, color_discrete_sequence=color_sequence, facet_col=facet_col_param, facet_row=facet_row_param)
-    elif chart_type == "Histograma":
-        # Selección del tipo de barra (barmode) para histograma
-        barmode = st.selectbox("Tipo de barra", ["grupo", "superpuesto", "relativo"], key=f"barmode_{key_suffix}")
-        barmode_dict = {"grupo": "group", "superpuesto": "overlay", "relativo": "relative"}
-        fig = px.histogram(df_plot, x=col_x, color=color_param, title=title, barmode=barmode_dict[barmode], color_discrete_sequence=color_sequence, facet_col=facet_col_param, facet_row=facet_row_param,category_orders=category_order)
+        # Verificar que las columnas seleccionadas existen en el DataFrame
+        if col_y not in df_plot.columns:
+            st.error(f"La columna '{col_y}' no se encuentra en los datos filtrados. Por favor, selecciona otra columna.")
+
+        with st.expander("Vista previa de datos filtrados", expanded=False):
+            st.dataframe(df_plot.dropna().head(1000))
 
     st.plotly_chart(fig, use_container_width=True, config=chart_config)
+    if compartible:
+        st.caption("🔗 El enlace de esta página guarda este gráfico: compártelo para que otros lo abran tal cual.")
+    else:
+        st.caption("🔗 Este gráfico tiene demasiadas selecciones para guardarlo en el enlace de la página.")
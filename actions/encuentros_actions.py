@@ -0,0 +1,144 @@
+import numpy as np
+import pandas as pd
+
+from constants.encuentros_constants import (
+    TODAS_LAS_FASES, CONDUCTAS_PERMITIDAS, CLAVES_OBSERVACION, MAX_ENCUENTROS, CATEGORIAS_ABIERTAS,
+)
+from utils.dataset_registry import url_dataset
+from utils.incremental import ConteoClaves, registrar_agregado, obtener_agregado
+from utils.partitioned_frame import ParticionFrame
+from utils.version_cache import por_version
+
+
+def particion_fases(df):
+    """Conjunto de datos de los encuentros particionado por 'Fase', una vez por versión de los datos."""
+    return por_version("particion_fases", df, lambda df: ParticionFrame(df, 'Fase'))
+
+
+def datos_fase(df, fase):
+    """Vista (sin copia) de las filas de la fase seleccionada, o de todas con TODAS_LAS_FASES."""
+    return particion_fases(df).vista(None if fase == TODAS_LAS_FASES else fase)
+
+
+def filtrar_conductas(df):
+    """Filas cuya Conducta (sin espacios sobrantes) está entre las conductas analizadas."""
+    return df[df['Conducta'].astype(str).str.strip().isin(CONDUCTAS_PERMITIDAS)]
+
+
+# Observaciones únicas de las conductas analizadas, actualizadas solo con las filas que cambian
+registrar_agregado(
+    url_dataset("encuentros_momentos"),
+    "conductas",
+    lambda: ConteoClaves(CLAVES_OBSERVACION, filtrar_conductas),
+)
+
+
+def observaciones_conductas(fase):
+    """
+    Observaciones únicas (Encuentro, tipo, momento, fase) de las conductas analizadas,
+    equivalentes a filtrar por conducta y aplicar drop_duplicates sobre la hoja completa.
+    """
+    claves = obtener_agregado(url_dataset("encuentros_momentos"), "conductas").claves()
+    if fase != TODAS_LAS_FASES:
+        claves = claves[claves['Fase'] == fase]
+    return claves
+
+
+def frecuencias_conductas(fase):
+    """
+    Devuelve (heatmap_data, freq_por_momento, freq_por_tipo) para la fase indicada,
+    a partir de las observaciones únicas mantenidas de forma incremental.
+    """
+    claves = observaciones_conductas(fase)
+    heatmap_data = claves.groupby(['Número de momento', 'tipo']).size().reset_index(name='Frecuencia')
+    freq_por_momento = claves.groupby('Número de momento').size().reset_index(name='Total_Observaciones')
+    freq_por_tipo = claves.groupby('tipo').size().reset_index(name='Total_Observaciones').sort_values('Total_Observaciones', ascending=True)
+    return heatmap_data, freq_por_momento, freq_por_tipo
+
+
+def matriz_cobertura(df, dimensiones, contar, niveles=None):
+    """
+    Cobertura sobre el producto cartesiano completo de las dimensiones: una fila por
+    combinación con los valores distintos de `contar` ('Distintos') y el número de filas
+    ('Observaciones'), en 0 para las combinaciones sin datos. Los niveles de cada dimensión
+    salen de los datos (en orden de aparición) salvo los que se pasen en `niveles`.
+    """
+    niveles = niveles or {}
+    completo = pd.MultiIndex.from_product(
+        [niveles[dim] if dim in niveles else df[dim].dropna().unique() for dim in dimensiones],
+        names=dimensiones,
+    )
+    conteos = df.groupby(dimensiones, sort=False)[contar].agg(Distintos='nunique', Observaciones='size')
+    return conteos.reindex(completo, fill_value=0).reset_index()
+
+
+def cobertura_transferencia(df, df_puntos):
+    """
+    Porcentaje de encuentros con transferencia de la experticia por tipo, participante y
+    momento. Los momentos son todos los observados en la hoja (`df`), aunque en alguno no
+    haya transferencia.
+    """
+    momentos = sorted(df['Número de momento'].dropna().unique())
+    cobertura = matriz_cobertura(
+        df_puntos, ['tipo', 'participante', 'Número de momento'], 'Encuentro',
+        niveles={'Número de momento': momentos},
+    )
+    return pd.DataFrame({
+        'Participante': cobertura['participante'],
+        'Momento': cobertura['Número de momento'],
+        'Tipo': cobertura['tipo'],
+        'Porcentaje_Encuentros': (cobertura['Distintos'] / MAX_ENCUENTROS * 100).round(1),
+        'Encuentros_Activos': cobertura['Distintos'],
+        'Total_Observaciones': cobertura['Observaciones'],
+    })
+
+
+def primeras_palabras(texto, num_palabras=3):
+    """Las primeras palabras del texto, con '...' si se recortó."""
+    palabras = texto.split()
+    if len(palabras) > num_palabras:
+        return " ".join(palabras[:num_palabras]) + "..."
+    return texto
+
+
+def _clasificar_preguntas(preguntas, categorias):
+    """Categoría de cada fila según su pregunta (la primera que coincida, o None); cada texto distinto se revisa una vez."""
+    codigos, unicas = pd.factorize(preguntas)
+    clases = [next((cat for cat in categorias if cat.lower() in str(pregunta).lower()), None) for pregunta in unicas]
+    return np.array(clases + [None], dtype=object)[codigos]
+
+
+def _conteo_respuestas_abiertas(df, categorias):
+    """Encuentros distintos por categoría, respuesta y fase, en una sola agrupación."""
+    df = df[df['Encuentro'].notna() & (df['Encuentro'] != '') & df['respuesta'].notna()]
+    claves = ['Categoria', 'respuesta'] + (['Fase'] if 'Fase' in df.columns else [])
+    observaciones = df.assign(Categoria=_clasificar_preguntas(df['pregunta'], categorias))
+    observaciones = observaciones[observaciones['Categoria'].notna()]
+    return (
+        observaciones.groupby(claves, dropna=False)['Encuentro'].nunique()
+        .rename('Numero_de_encuentros').reset_index()
+    )
+
+
+def respuestas_abiertas(df, fase=TODAS_LAS_FASES, categorias=CATEGORIAS_ABIERTAS):
+    """
+    Número de encuentros en que aparece cada respuesta abierta, por categoría de pregunta:
+    {categoría: DataFrame(Respuesta, Numero_de_encuentros, Respuesta_Corta)} ordenado de menor
+    a mayor. Los conteos por fase se calculan una vez por versión de los datos; como cada
+    encuentro pertenece a una fase, el total de varias fases es la suma de sus conteos.
+    """
+    categorias = tuple(categorias)
+    conteo = por_version(("respuestas_abiertas", categorias), df, lambda df: _conteo_respuestas_abiertas(df, categorias))
+    if fase != TODAS_LAS_FASES and 'Fase' in conteo.columns:
+        conteo = conteo[conteo['Fase'] == fase]
+    totales = conteo.groupby(['Categoria', 'respuesta'])['Numero_de_encuentros'].sum()
+    categorias_presentes = set(totales.index.get_level_values('Categoria'))
+    resultado = {}
+    for categoria in categorias:
+        if categoria in categorias_presentes:
+            ranking = totales.xs(categoria, level='Categoria').rename_axis('Respuesta').reset_index()
+        else:
+            ranking = pd.DataFrame({'Respuesta': [], 'Numero_de_encuentros': []})
+        ranking['Respuesta_Corta'] = ranking['Respuesta'].map(primeras_palabras)
+        resultado[categoria] = ranking.sort_values('Numero_de_encuentros', ascending=True, kind='stable')
+    return resultado
@@ -1,12 +1,13 @@
 # Archivo: actions.py
-import pandas as pd
 import streamlit as st
 import geopandas as gpd # type: ignore
 from constants.home_constants import NODOS_MAP_FILEPATH
+from utils.sheet_refresher import obtener_datos
+import utils.dataset_registry  # registra todas las fuentes en el refrescador
 
 def cargar_datos(csv):
-    """leer csv desde url"""
-    return pd.read_csv(csv)
+    """leer csv desde url (copia mantenida por el refrescador en segundo plano)"""
+    return obtener_datos(csv)
 
 
 def obtener_datos_nodos(csv):
@@ -1,7 +1,13 @@
+import warnings
+
 import streamlit as st
+import numpy as np
 import pandas as pd
 import plotly.graph_objects as go # type: ignore
-from constants.marco_constants import CSV_URL, MAPPING, COLORS
+from constants.marco_constants import MAPPING, COLORS, OPCIONES_INICIALES, MOMENTOS
+from utils.dataset_registry import cargar_dataset
+from utils.version_cache import por_version
+
 def centrar_texto(texto, tipo="h1"):
     """Centrar headers, subheaders y textos en Streamlit."""
     st.markdown(f"<{tipo} style='text-align: center;'>{texto}</{tipo}>", unsafe_allow_html=True)
@@ -10,31 +16,87 @@ def centrar_texto(texto, tipo="h1"):
 def cargar_datos():
     """
     Carga los datos desde el archivo CSV publicado en Google Sheets.
+    El refrescador en segundo plano mantiene la copia al día.
     """
-    return pd.read_csv(CSV_URL)
+    return cargar_dataset("marco_calidad")
 
 def obtener_opciones_codigos(df):
     """
     Genera las opciones de códigos de IE, combinando las opciones iniciales con los valores únicos de los códigos de IE.
     """
-    opciones_codigos = ['Promedio', 'Moda', 'Mediana'] + [codigo for codigo in df['Código IE'].unique() if codigo not in ['Promedio', 'Moda', 'Mediana']]
-    return opciones_codigos
+    return perfiles_marco(df).opciones
+
+class PerfilesMarco:
+    """
+    Toda la hoja del marco de calidad codificada con MAPPING en un arreglo
+    (institución x momento x dimensión), NaN donde no hay dato, junto con los perfiles
+    Promedio, Moda y Mediana de todas las instituciones y las opciones del selector. Cada
+    institución se ubica por su código con un diccionario; si un código y momento se
+    repite, cuenta la primera fila.
+    """
+
+    def __init__(self, df):
+        self.dimensiones = list(df.columns[2:])
+        self.opciones = OPCIONES_INICIALES + [
+            codigo for codigo in pd.unique(df['Código IE']) if codigo not in OPCIONES_INICIALES
+        ]
+        filas = df[df['Momento'].isin(MOMENTOS) & ~df['Código IE'].isin(OPCIONES_INICIALES)]
+        filas = filas.drop_duplicates(['Código IE', 'Momento'], keep='first')
+        codigos_ie, self.codigos = pd.factorize(filas['Código IE'])
+        self.posicion = {codigo: i for i, codigo in enumerate(self.codigos)}
+        momentos = pd.Categorical(filas['Momento'], categories=MOMENTOS).codes
+
+        escala = np.array(list(MAPPING.values()), dtype=np.float64)
+        niveles = np.column_stack([
+            pd.Categorical(filas[dim].astype(str).str.strip(), categories=list(MAPPING)).codes
+            for dim in self.dimensiones
+        ]) if self.dimensiones else np.empty((len(filas), 0), dtype=np.int8)
+        valores = np.where(niveles >= 0, escala[niveles], np.nan)
+
+        self.valores = np.full((len(self.codigos), len(MOMENTOS), len(self.dimensiones)), np.nan)
+        self.valores[codigos_ie, momentos] = valores
+        self.completo = np.zeros((len(self.codigos), len(MOMENTOS)), dtype=bool)
+        self.completo[codigos_ie, momentos] = True
+
+        self.perfiles = {}
+        # Dimensiones sin ningún dato quedan en NaN (sin la advertencia de nanmean/nanmedian)
+        with warnings.catch_warnings():
+            warnings.simplefilter('ignore', RuntimeWarning)
+            self.perfiles['Promedio'] = np.nanmean(self.valores, axis=0)
+            self.perfiles['Mediana'] = np.nanmedian(self.valores, axis=0)
+        # Moda: el nivel más frecuente por momento y dimensión (el menor si hay empate)
+        conteos = np.stack([(self.valores == nivel).sum(axis=0) for nivel in escala])
+        self.perfiles['Moda'] = np.where(conteos.any(axis=0), escala[conteos.argmax(axis=0)], np.nan)
+
+    def perfil(self, codigo):
+        """Arreglo (momento x dimensión) de una institución o de un perfil agregado; None si falta un momento."""
+        if codigo in self.perfiles:
+            return self.perfiles[codigo]
+        i = self.posicion.get(codigo)
+        if i is None or not self.completo[i].all():
+            return None
+        return self.valores[i]
+
+
+def perfiles_marco(df):
+    """Perfiles del marco de calidad, codificados una sola vez por versión de los datos."""
+    return por_version("perfiles_marco", df, PerfilesMarco)
+
 
-def obtener_datos_pretest_posttest(datos_codigo):
+def obtener_datos_pretest_posttest(df, codigo):
     """
-    Obtiene los datos de Pretest y Posttest de un código de IE.
+    Obtiene los datos de Pretest y Posttest de un código de IE o de un perfil (Promedio,
+    Moda, Mediana), leídos de los perfiles precalculados de la hoja `df`.
     """
-    if 'Pretest' in datos_codigo['Momento'].values and 'Posttest' in datos_codigo['Momento'].values:
-        pretest = datos_codigo[datos_codigo['Momento'] == 'Pretest'].iloc[0, 2:]
-        posttest = datos_codigo[datos_codigo['Momento'] == 'Posttest'].iloc[0, 2:]
-
-        pretest_numeric = pretest.map(MAPPING)
-        posttest_numeric = posttest.map(MAPPING)
-        pretest_numeric = pd.concat([pretest_numeric, pd.Series([pretest_numeric.iloc[0]])], ignore_index=True)
-        posttest_numeric = pd.concat([posttest_numeric, pd.Series([posttest_numeric.iloc[0]])], ignore_index=True)
-        categorias = list(pretest.index)
-        return pretest_numeric, posttest_numeric, categorias
-    return None, None, None
+    perfiles = perfiles_marco(df)
+    valores = perfiles.perfil(codigo)
+    if valores is None:
+        return None, None, None
+    pretest, posttest = valores[MOMENTOS.index('Pretest')], valores[MOMENTOS.index('Posttest')]
+    # El primer valor se repite al final para cerrar el radar
+    pretest_numeric = pd.Series(np.append(pretest, pretest[:1]))
+    posttest_numeric = pd.Series(np.append(posttest, posttest[:1]))
+    return pretest_numeric, posttest_numeric, list(perfiles.dimensiones)
 
 def crear_grafico_radar(pretest_numeric, posttest_numeric, categorias, codigo):
     """
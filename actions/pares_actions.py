@@ -0,0 +1,141 @@
+import pandas as pd
+import streamlit as st
+
+from constants.schema_constants import BLOQUES_PARES, DIMENSIONES_SEGMENTO, NIVEL_CONFIANZA, PARAMETRO_SEGMENTO
+from utils.dataset_registry import url_dataset
+from utils.bootstrap import intervalos_bootstrap
+from utils.chart_url import codificar_spec, decodificar_spec
+from utils.correlation import correlaciones
+from utils.incremental import AgregadoBloques, registrar_agregado, leer_agregado
+from utils.likert_matrix import codificar_matriz, matriz_likert
+from utils.segment_cube import CuboSegmentos
+from utils.version_cache import por_version, registrar_derivado, obtener_derivado
+
+# Promedios de los bloques Likert/frecuencia/0-10, actualizados solo con las filas que cambian
+registrar_agregado(url_dataset("pares"), "bloques", lambda: AgregadoBloques(BLOQUES_PARES, codificar_matriz))
+
+# Cubo por segmento, construido sobre la misma matriz de puntajes que usan los tableros
+registrar_derivado(
+    "cubo_pares", lambda df, matriz: CuboSegmentos(df, DIMENSIONES_SEGMENTO, BLOQUES_PARES, matriz), "matriz_likert"
+)
+
+
+def cubo_pares(df):
+    """Cubo de agregados por segmento de la encuesta de pares, construido una vez por versión."""
+    return obtener_derivado("cubo_pares", df)
+
+
+def resumen_bloque(df, bloque, segmento=None):
+    """
+    Devuelve (n, promedios, desviaciones) de un bloque de preguntas de la encuesta
+    de pares `df`, calculados sobre los casos completos del bloque. Sin segmento se usan
+    los agregados incrementales si están en la misma versión que `df`; si no, o con
+    segmento, el cubo de agregados por segmento de `df`.
+    """
+    if not segmento:
+        resumen = leer_agregado(url_dataset("pares"), "bloques", df.attrs.get("version"), lambda agregado: agregado.resumen(bloque))
+        if resumen is not None:
+            return resumen
+    return cubo_pares(df).resumen(bloque, segmento)
+
+
+def _clave_segmento(segmento):
+    """Clave hashable de un segmento {dimensión: [niveles]}, sin las dimensiones vacías."""
+    return tuple(sorted((dim, tuple(niveles)) for dim, niveles in (segmento or {}).items() if niveles))
+
+
+def _intervalos(df, bloque, segmento):
+    matriz = matriz_likert(df)
+    cols = BLOQUES_PARES[bloque]
+    filas = matriz.completos(cols)
+    if segmento:
+        filas &= cubo_pares(df).filas_segmento(segmento)
+    inferior, superior = intervalos_bootstrap(matriz.bloque(cols)[filas])
+    return pd.DataFrame({'Inferior': inferior, 'Superior': superior}, index=cols)
+
+
+def intervalos_bloque(df, bloque, segmento=None):
+    """
+    Intervalos de confianza bootstrap (columnas 'Inferior' y 'Superior', una fila por
+    pregunta) de los promedios del bloque en el segmento, calculados una vez por versión.
+    """
+    return por_version(("intervalos", bloque, _clave_segmento(segmento)), df, lambda df: _intervalos(df, bloque, segmento))
+
+
+def margenes_error(df, promedios, bloque, segmento=None):
+    """(margen superior, margen inferior) del intervalo de cada promedio, alineados con `promedios`."""
+    intervalos = intervalos_bloque(df, bloque, segmento).reindex(promedios.index)
+    return (intervalos['Superior'] - promedios).to_numpy(), (promedios - intervalos['Inferior']).to_numpy()
+
+
+def _correlaciones(df, segmento):
+    matriz = matriz_likert(df)
+    cols = [col for cols in BLOQUES_PARES.values() for col in cols if matriz.contiene([col])]
+    valores = matriz.bloque(cols)
+    if segmento:
+        valores = valores[cubo_pares(df).filas_segmento(segmento)]
+    return correlaciones(valores, cols)
+
+
+def matrices_correlacion(df, segmento=None):
+    """
+    Correlaciones de Pearson y Spearman (y casos comunes) entre todas las preguntas de
+    todos los bloques, por pares de casos completos; una vez por versión y segmento.
+    """
+    return por_version(("correlaciones", _clave_segmento(segmento)), df, lambda df: _correlaciones(df, segmento))
+
+
+def _restaurar_segmento(cubo):
+    """
+    La primera vez que la sesión abre la página, pone el selector en el segmento guardado
+    en la URL (si lo hay), sin los niveles que ya no existen en los datos.
+    """
+    if st.session_state.get("segmento_pares_restaurado"):
+        return
+    st.session_state["segmento_pares_restaurado"] = True
+    texto = st.query_params.get(PARAMETRO_SEGMENTO)
+    if not texto:
+        return
+    try:
+        guardado = decodificar_spec(texto)
+        for dim in cubo.dimensiones:
+            niveles = [nivel for nivel in guardado.get(dim, []) if nivel in cubo.niveles[dim]]
+            if niveles:
+                st.session_state[f"segmento_pares_{dim}"] = niveles
+    except (ValueError, TypeError):
+        st.sidebar.warning("El enlace no contiene un segmento válido: se muestra toda la encuesta.")
+
+
+def selector_segmento(df):
+    """
+    Muestra en la barra lateral el selector global de segmentos y devuelve la selección
+    como {dimensión: [niveles]}, con solo las dimensiones filtradas (vacío = toda la encuesta).
+    La selección se guarda en la URL, así que un enlace compartido abre el mismo segmento.
+    """
+    cubo = cubo_pares(df)
+    _restaurar_segmento(cubo)
+    segmento = {}
+    with st.sidebar:
+        st.header("🎯 Segmento")
+        for dim in cubo.dimensiones:
+            elegidos = st.multiselect(DIMENSIONES_SEGMENTO[dim], cubo.niveles[dim], key=f"segmento_pares_{dim}")
+            if elegidos:
+                segmento[dim] = elegidos
+        st.caption(f"{cubo.total(segmento)} de {cubo.total()} docentes en el segmento")
+        st.caption(f"Las barras de error son intervalos de confianza del {NIVEL_CONFIANZA:.0%} (bootstrap).")
+    if segmento:
+        st.query_params[PARAMETRO_SEGMENTO] = codificar_spec(segmento)
+    elif PARAMETRO_SEGMENTO in st.query_params:
+        del st.query_params[PARAMETRO_SEGMENTO]
+    return segmento
+
+
+def filtrar_segmento(df, segmento):
+    """
+    Respuestas del DataFrame que pertenecen al segmento (el mismo DataFrame si no hay filtro).
+    El resultado se comparte, una vez por versión y segmento, y no debe modificarse: así su
+    huella (y lo que se guarda con ella, como los perfiles de columnas) se calcula una sola vez.
+    """
+    if not segmento:
+        return df
+    return por_version(("segmento", _clave_segmento(segmento)), df, lambda df: df[cubo_pares(df).filas_segmento(segmento)])
@@ -1,6 +1,12 @@
 
 import streamlit as st
+from utils.dataset_registry import prefetch_datasets
+from utils.sheet_refresher import iniciar_refrescador
 def main(): 
+    # Descarga en paralelo todas las fuentes de datos y las mantiene al día en segundo
+    # plano (solo la primera vez en el proceso)
+    prefetch_datasets()
+    iniciar_refrescador()
     pages = {
         "": [
             st.Page(
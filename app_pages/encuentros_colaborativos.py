@@ -4,10 +4,17 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 from actions.chart_actions import graficador
+from actions.pares_actions import matrices_correlacion
+from actions.encuentros_actions import (
+    frecuencias_conductas, cobertura_transferencia, respuestas_abiertas, particion_fases, datos_fase,
+)
+from constants.encuentros_constants import TODAS_LAS_FASES, CONDUCTAS_PERMITIDAS, CATEGORIAS_ABIERTAS
 from constants.footer_constants import FOOTER_HTML, IMAGENES_BASE64
 from constants.header_constants import LOGO_NAVBAR_BASE64, HIDE_STREAMLIT_STYLE, NAVBAR_TEMPLATE, generar_css_personalizado
 from utils.chart_config import get_chart_config
 from constants.header_constants import header
+from utils.dataset_registry import cargar_dataset
+from utils.likert_matrix import bloque_numerico
 # ==========================================
 # CONFIGURACIÓN INICIAL
 # ==========================================
@@ -91,13 +98,13 @@ header()
 # ==========================================
 # CARGA DE DATOS
 # ==========================================
-# URL del CSV
+# Los conjuntos de datos están registrados en utils/dataset_registry.py
+# y se precargan en paralelo al iniciar la aplicación
 
-@st.cache_data(ttl=600)
-def load_data(file):
-    """Cargar datos desde URL"""
+def load_data(nombre):
+    """Cargar un conjunto de datos registrado (última copia en memoria o en disco)"""
     try:
-        df = pd.read_csv(file, encoding='utf-8')
+        df = cargar_dataset(nombre)
         return df
     except Exception as e:
         st.error(f"Error al cargar los datos: {e}")
@@ -114,14 +121,13 @@ def hallazgos_generales():
     # Selector de fase al inicio
     st.subheader("🔍 Selección de Fase")
     
-    # Cargar datos temporalmente para obtener las fases disponibles
-    url="https://docs.google.com/spreadsheets/d/e/2PACX-1vQzYORLJ_nV7qv_vP2hrWmdV8Sm2rOpQPSNH9WLKJkJoHyfIOgBsrJu-uh-6_MYDg/pub?output=csv"
-    df_temp = load_data(url)
+    # Cargar los datos una sola vez; las fases disponibles salen de la partición por fase
+    df_momentos = load_data("encuentros_momentos")
     
-    if not df_temp.empty and 'Fase' in df_temp.columns:
-        fases_disponibles = sorted(df_temp['Fase'].dropna().unique())
+    if not df_momentos.empty and 'Fase' in df_momentos.columns:
+        fases_disponibles = particion_fases(df_momentos).claves
         # Agregar opción "Todas las fases"
-        opciones_fase = ["Todas las fases"] + list(fases_disponibles)
+        opciones_fase = [TODAS_LAS_FASES] + list(fases_disponibles)
         
         fase_seleccionada = st.selectbox(
             "Selecciona la fase a analizar:",
@@ -135,18 +141,8 @@ def hallazgos_generales():
         st.warning("No se encontró la columna 'Fase' en los datos o los datos están vacíos.")
         return
     
-    # Cargar y filtrar datos por fase seleccionada
-    df = load_data(url)
-    if not df.empty and 'Fase' in df.columns:
-        if fase_seleccionada == "Todas las fases":
-            # No filtrar, mantener todas las fases
-            df = df.copy()
-        else:
-            # Filtrar por la fase específica seleccionada
-            df = df[df['Fase'] == fase_seleccionada].copy()
-    else:
-        st.error("No se pudo filtrar por fase. Verifica que los datos contengan la columna 'Fase'.")
-        return
+    # Vista de la fase seleccionada
+    df = datos_fase(df_momentos, fase_seleccionada)
     
     if df.empty:
         st.warning("No hay datos válidos para el mapa de calor.")
@@ -164,22 +160,14 @@ def hallazgos_generales():
     # Limpiar espacios en blanco en la columna Conducta
     df['Conducta'] = df['Conducta'].astype(str).str.strip()
     
-    # Filtrar INCLUYENDO solo las Conductas específicas
-    Conductas_permitidas = ['Transferencia de la experticia', 'Instrucción centrada en el estudiante', 'Enfoque de género']
-    df_filtered = df[
-        (df['Conducta'].isin(Conductas_permitidas))
-    ].copy()
-    
-    # Filtrar para que solo aparezca un Encuentro único por cada tipo y número de momento
-    df_filtered = df_filtered.drop_duplicates(subset=['Encuentro', 'tipo', 'Número de momento','Fase'])
-    if df_filtered.empty:
+    # Conductas específicas con un Encuentro único por cada tipo, número de momento y fase.
+    # Las tablas se mantienen de forma incremental: cada refresco solo procesa las filas nuevas
+    heatmap_data, freq_por_momento, freq_por_tipo = frecuencias_conductas(fase_seleccionada)
+    if freq_por_momento.empty:
         st.warning("No hay datos válidos después de aplicar los filtros.")
         st.info(f"Valores únicos en 'Conducta' (limpiados): {df['Conducta'].unique().tolist()}")
-        st.info(f"Conductas buscadas: {Conductas_permitidas}")
+        st.info(f"Conductas buscadas: {CONDUCTAS_PERMITIDAS}")
         return
-    # Usar directamente la columna "Número de momento"
-    # Crear una tabla de frecuencias para el mapa de calor
-    heatmap_data = df_filtered.groupby(['Número de momento', 'tipo']).size().reset_index(name='Frecuencia')
     
     # Crear tabla pivote para el mapa de calor
     pivot_data = heatmap_data.pivot(index='tipo', columns='Número de momento', values='Frecuencia').fillna(0)
@@ -233,8 +221,6 @@ def hallazgos_generales():
     
     with col1:
         # Gráfico de barras: Frecuencia por momento (Conductas específicas)
-        freq_por_momento = df_filtered.groupby('Número de momento').size().reset_index(name='Total_Observaciones')
-        
         # Calcular el total general para obtener porcentajes
         total_general = freq_por_momento['Total_Observaciones'].sum()
         freq_por_momento['Porcentaje'] = (freq_por_momento['Total_Observaciones'] / total_general * 100).round(1)
@@ -265,8 +251,6 @@ def hallazgos_generales():
         st.plotly_chart(fig_bar_momentos, use_container_width=True, config=chart_config)
     with col2:
         # Gráfico de barras: Frecuencia por tipo (Conductas específicas)
-        freq_por_tipo = df_filtered.groupby('tipo').size().reset_index(name='Total_Observaciones').sort_values('Total_Observaciones', ascending=True)
-        
         fig_bar_tipos = px.bar(
             freq_por_tipo,
             x='Total_Observaciones',
@@ -285,48 +269,14 @@ def hallazgos_generales():
     
     df_puntos = df[ 
         (df['Conducta'].isin(['Transferencia de la experticia']))
-    ].copy()
+    ]
     
     # Gráfica de líneas: Momento vs Porcentaje de Encuentros por Participante
     st.subheader(" Análisis de Líneas: Transferencia de la Experticia por Participante y Momento")
     
     if not df_puntos.empty and 'Encuentro' in df_puntos.columns and 'participante' in df_puntos.columns and 'tipo' in df_puntos.columns:
         # Calcular el porcentaje por momento, participante y tipo
-        max_encuentros = 9
-        porcentaje_por_participante = []
-        
-        # Obtener todos los participantes únicos
-        participantes_unicos = df_puntos['participante'].unique()
-        tipos_unicos = df_puntos['tipo'].unique()
-        momentos_completos = range(1, 5)  # Asegurar que tenemos todos los momentos del 1 al 9
-        
-        for tipo in tipos_unicos:
-            for participante in participantes_unicos:
-                df_subset = df_puntos[(df_puntos['participante'] == participante) & (df_puntos['tipo'] == tipo)]
-                
-                # Procesar TODOS los momentos, incluso si no hay datos
-                for momento in momentos_completos: 
-                    if not df_subset.empty and momento in df_subset['Número de momento'].values:
-                        # Hay datos para este momento
-                        encuentros_en_momento = df_subset[df_subset['Número de momento'] == momento]['Encuentro'].nunique()
-                        porcentaje = round((encuentros_en_momento / max_encuentros) * 100, 1)
-                        total_obs = len(df_subset[df_subset['Número de momento'] == momento])
-                    else:
-                        # No hay datos para este momento, usar 0
-                        encuentros_en_momento = 0
-                        porcentaje = 0.0
-                        total_obs = 0
-                    
-                    porcentaje_por_participante.append({
-                        'Participante': participante,
-                        'Momento': momento,
-                        'Tipo': tipo,
-                        'Porcentaje_Encuentros': porcentaje,
-                        'Encuentros_Activos': encuentros_en_momento,
-                        'Total_Observaciones': total_obs
-                    })
-        
-        df_lineas = pd.DataFrame(porcentaje_por_participante)
+        df_lineas = cobertura_transferencia(df, df_puntos)
         
         if not df_lineas.empty:
             # Crear gráfico de líneas con facet_col
@@ -433,20 +383,15 @@ def hallazgos_generales():
         st.warning("No hay datos disponibles para 'Transferencia de la experticia' o faltan las columnas necesarias ('Encuentro', 'participante' o 'tipo').")
    
    
-    url_2="https://docs.google.com/spreadsheets/d/e/2PACX-1vT7ngk1_bT8zj18I7yzTKeI74316aXaUvKgyx8ww8OzjL0l1_1ewFwcJqW3hBFyuw/pub?output=csv"
-    df_2 = load_data(url_2)
+    df_2 = load_data("encuentros_genero")
 
     if df_2.empty:
         st.warning("No hay datos válidos para docentes por sexo.")
         return
     
-    # Filtrar por fase seleccionada
+    # Vista de la fase seleccionada
     if 'Fase' in df_2.columns:
-        if fase_seleccionada == "Todas las fases":
-            # No filtrar, mantener todas las fases
-            df_2 = df_2.copy()
-        else:
-            df_2 = df_2[df_2['Fase'] == fase_seleccionada].copy()
+        df_2 = datos_fase(df_2, fase_seleccionada)
     else:
         st.warning("La columna 'Fase' no está disponible en el segundo conjunto de datos.")
         return
@@ -463,10 +408,9 @@ def hallazgos_generales():
     df_2['Conducta'] = df_2['Conducta'].astype(str).str.strip()
 
     # Y INCLUYENDO solo las Conductas específicas
-    Conductas_permitidas = ['Transferencia de la experticia', 'Instrucción centrada en el estudiante', 'Enfoque de género']
     df_filtered_genero = df_2[
-        (df_2['Conducta'].isin(Conductas_permitidas))
-    ].copy()
+        (df_2['Conducta'].isin(CONDUCTAS_PERMITIDAS))
+    ]
     
     # Verificar si existe la columna 'sexo'
     if 'sexo' not in df_filtered_genero.columns:
@@ -612,23 +556,13 @@ def hallazgos_generales():
         else:
             st.warning("No hay datos válidos para crear la gráfica de participación por género.")
     
-    url_3="https://docs.google.com/spreadsheets/d/e/2PACX-1vSq4YCoKLIOBuBJGv-V4FwZLccdOOFYRjkrNsKrkME7tFeRSC15J2FFD2GjwgbwPg/pub?output=csv"
-    df_3 = load_data(url_3)
+    df_3 = load_data("encuentros_respuestas")
     
     if not df_3.empty:
-        # Filtrar por fase seleccionada
-        if 'Fase' in df_3.columns:
-            if fase_seleccionada == "Todas las fases":
-                # No filtrar, mantener todas las fases
-                df_3 = df_3.copy()
-            else:
-                df_3 = df_3[df_3['Fase'] == fase_seleccionada].copy()
-        else:
+        if 'Fase' not in df_3.columns:
             st.warning("La columna 'Fase' no está disponible en el tercer conjunto de datos.")
             return
         
-        st.subheader("📊 Análisis de Fortalezas por Encuentro")
-        
         # Verificar que las columnas necesarias existen
         required_columns_3 = ['Encuentro', 'pregunta', 'respuesta']
         missing_columns_3 = [col for col in required_columns_3 if col not in df_3.columns]
@@ -636,230 +570,28 @@ def hallazgos_generales():
         if missing_columns_3:
             st.error(f"Columnas faltantes en los datos: {missing_columns_3}")
             st.info("Las columnas disponibles son: " + ", ".join(df_3.columns.tolist()))
-        else:
-            # Limpiar datos: eliminar filas con Encuentro vacío
-            df_3_clean = df_3[df_3['Encuentro'].notna() & (df_3['Encuentro'] != '')].copy()
-            
-            # Filtrar solo las filas donde 'pregunta' contenga 'Fortaleza'
-            df_3_clean = df_3_clean[df_3_clean['pregunta'].str.contains('Fortaleza', case=False, na=False)].copy()
-            
-            if df_3_clean.empty:
-                st.warning("No hay datos válidos después de filtrar por 'Fortaleza'.")
-                return
-            
-            # Extraer número del encuentro para ordenar correctamente
-            df_3_clean['Encuentro_Num'] = df_3_clean['Encuentro'].str.extract('(\d+)').astype(int)
-            
-            # Crear identificador único considerando Encuentro + Fase para evitar duplicados entre fases
-            if 'Fase' in df_3_clean.columns:
-                df_3_clean['Encuentro_Fase_Unico'] = df_3_clean['Encuentro'].astype(str) + '_' + df_3_clean['Fase'].astype(str)
-                # Contar encuentros únicos por respuesta considerando fase
-                conteo_por_pregunta = df_3_clean.groupby('respuesta')['Encuentro_Fase_Unico'].nunique().reset_index()
-            else:
-                # Fallback si no hay columna Fase
-                conteo_por_pregunta = df_3_clean.groupby('respuesta')['Encuentro'].nunique().reset_index()
-            
-            conteo_por_pregunta.columns = ['Respuesta', 'Numero_de_encuentros']
-            # Función para tomar solo las primeras palabras
-            def primeras_palabras(texto, num_palabras=3):
-                palabras = texto.split()
-                if len(palabras) > num_palabras:
-                    return " ".join(palabras[:num_palabras]) + "..."
-                return texto
-            
-            # Aplicar función a las respuestas
-            conteo_por_pregunta['Respuesta_Corta'] = conteo_por_pregunta['Respuesta'].apply(lambda x: primeras_palabras(x, 3))
-            
-            # Ordenar por número de encuentros de mayor a menor
-            conteo_por_pregunta = conteo_por_pregunta.sort_values('Numero_de_encuentros', ascending=True)
-            
-            # Crear el gráfico de barras horizontal
-            fig_condiciones = px.bar(
-                conteo_por_pregunta,
-                x='Numero_de_encuentros',
-                y='Respuesta_Corta',
-                title="Número de Encuentros por Fortaleza",
-                labels={
-                    'Numero_de_encuentros': 'Número de encuentros',
-                    'Respuesta_Corta': 'Fortaleza'
-                },
-                color='Numero_de_encuentros',
-                color_continuous_scale=COLOR_PALETTE['blue_scale'],
-                text='Numero_de_encuentros',
-                orientation='h',
-                hover_data={'Respuesta': True, 'Respuesta_Corta': False}  # Mostrar texto completo en hover
-            )
-            
-            # Personalizar el gráfico
-            fig_condiciones.update_traces(
-                texttemplate='%{text}',
-                textposition='outside'
-            )
-            
-            fig_condiciones.update_layout(
-                height=400,  # Aumentar altura del gráfico
-                yaxis_title="Fortalezas",
-                xaxis_title="Número de encuentros",
-                showlegend=False,
-                font=dict(size=12),
-                xaxis=dict(
-                    range=[0, max(conteo_por_pregunta['Numero_de_encuentros']) * 1.1]
-                ),
-                yaxis=dict(
-                    tickfont=dict(size=10),  # Tamaño de fuente legible
-                    automargin=True  # Ajuste automático de márgenes
-                ),
-                margin=dict(l=150, r=50, t=80, b=50)  # Márgenes ajustados para barras horizontales
-            )
-            
-            st.plotly_chart(fig_condiciones, use_container_width=True, config=chart_config)
-        
-        
-        
-        st.subheader("📊 Análisis de Condiciones por Encuentro")
-        
-        # Verificar que las columnas necesarias existen
-        required_columns_3 = ['Encuentro', 'pregunta', 'respuesta']
-        missing_columns_3 = [col for col in required_columns_3 if col not in df_3.columns]
-        
-        if missing_columns_3:
-            st.error(f"Columnas faltantes en los datos: {missing_columns_3}")
-            st.info("Las columnas disponibles son: " + ", ".join(df_3.columns.tolist()))
-        else:
-            # Limpiar datos: eliminar filas con Encuentro vacío
-            df_3_clean = df_3[df_3['Encuentro'].notna() & (df_3['Encuentro'] != '')].copy()
-            
-            # Filtrar solo las filas donde 'pregunta' contenga 'Condicion '
-            df_3_clean = df_3_clean[df_3_clean['pregunta'].str.contains('Condicion', case=False, na=False)].copy()
-            
-            if df_3_clean.empty:
-                st.warning("No hay datos válidos después de filtrar por 'Condicion '.")
-                return
-            
-            # Extraer número del encuentro para ordenar correctamente
-            df_3_clean['Encuentro_Num'] = df_3_clean['Encuentro'].str.extract('(\d+)').astype(int)
-            
-            # Crear identificador único considerando Encuentro + Fase para evitar duplicados entre fases
-            if 'Fase' in df_3_clean.columns:
-                df_3_clean['Encuentro_Fase_Unico'] = df_3_clean['Encuentro'].astype(str) + '_' + df_3_clean['Fase'].astype(str)
-                # Contar encuentros únicos por respuesta considerando fase
-                conteo_por_pregunta = df_3_clean.groupby('respuesta')['Encuentro_Fase_Unico'].nunique().reset_index()
-            else:
-                # Fallback si no hay columna Fase
-                conteo_por_pregunta = df_3_clean.groupby('respuesta')['Encuentro'].nunique().reset_index()
-            
-            conteo_por_pregunta.columns = ['Respuesta', 'Numero_de_encuentros']
-            
-            # Función para tomar solo las primeras palabras
-            def primeras_palabras(texto, num_palabras=3):
-                palabras = texto.split()
-                if len(palabras) > num_palabras:
-                    return " ".join(palabras[:num_palabras]) + "..."
-                return texto
-            
-            # Aplicar función a las respuestas
-            conteo_por_pregunta['Respuesta_Corta'] = conteo_por_pregunta['Respuesta'].apply(lambda x: primeras_palabras(x, 3))
-            
-            # Ordenar por número de encuentros de mayor a menor
-            conteo_por_pregunta = conteo_por_pregunta.sort_values('Numero_de_encuentros', ascending=True)
-            
-            # Crear el gráfico de barras horizontal
-            fig_condiciones = px.bar(
-                conteo_por_pregunta,
-                x='Numero_de_encuentros',
-                y='Respuesta_Corta',
-                title="Número de Encuentros por Condición",
-                labels={
-                    'Numero_de_encuentros': 'Número de encuentros',
-                    'Respuesta_Corta': 'Condición'
-                },
-                color='Numero_de_encuentros',
-                color_continuous_scale=COLOR_PALETTE['blue_scale'],
-                text='Numero_de_encuentros',
-                orientation='h',
-                hover_data={'Respuesta': True, 'Respuesta_Corta': False}  # Mostrar texto completo en hover
-            )
-            
-            # Personalizar el gráfico
-            fig_condiciones.update_traces(
-                texttemplate='%{text}',
-                textposition='outside'
-            )
-            
-            fig_condiciones.update_layout(
-                height=400,  # Aumentar altura del gráfico
-                yaxis_title="Condiciones",
-                xaxis_title="Número de encuentros",
-                showlegend=False,
-                font=dict(size=12),
-                xaxis=dict(
-                    range=[0, max(conteo_por_pregunta['Numero_de_encuentros']) * 1.1]
-                ),
-                yaxis=dict(
-                    tickfont=dict(size=10),  # Tamaño de fuente legible
-                    automargin=True  # Ajuste automático de márgenes
-                ),
-                margin=dict(l=150, r=50, t=80, b=50)  # Márgenes ajustados para barras horizontales
-            )
-            
-            st.plotly_chart(fig_condiciones, use_container_width=True, config=chart_config)
+            return
         
-        st.subheader("📊 Análisis de Debilidades por Encuentro")
+        # Encuentros por respuesta de todas las categorías, filtrados por la fase seleccionada
+        conteos_abiertas = respuestas_abiertas(df_3, fase_seleccionada)
         
-        # Verificar que las columnas necesarias existen
-        required_columns_3 = ['Encuentro', 'pregunta', 'respuesta']
-        missing_columns_3 = [col for col in required_columns_3 if col not in df_3.columns]
-        
-        if missing_columns_3:
-            st.error(f"Columnas faltantes en los datos: {missing_columns_3}")
-            st.info("Las columnas disponibles son: " + ", ".join(df_3.columns.tolist()))
-        else:
-            # Limpiar datos: eliminar filas con Encuentro vacío
-            df_3_clean = df_3[df_3['Encuentro'].notna() & (df_3['Encuentro'] != '')].copy()
+        for categoria, (etiqueta, etiqueta_plural) in CATEGORIAS_ABIERTAS.items():
+            st.subheader(f"📊 Análisis de {etiqueta_plural} por Encuentro")
             
-            # Filtrar solo las filas donde 'pregunta' contenga 'Debilidad'
-            df_3_clean = df_3_clean[df_3_clean['pregunta'].str.contains('Debilidad', case=False, na=False)].copy()
-            
-            if df_3_clean.empty:
-                st.warning("No hay datos válidos después de filtrar por 'Debilidad'.")
-                return
-            
-            # Extraer número del encuentro para ordenar correctamente
-            df_3_clean['Encuentro_Num'] = df_3_clean['Encuentro'].str.extract('(\d+)').astype(int)
-            
-            # Crear identificador único considerando Encuentro + Fase para evitar duplicados entre fases
-            if 'Fase' in df_3_clean.columns:
-                df_3_clean['Encuentro_Fase_Unico'] = df_3_clean['Encuentro'].astype(str) + '_' + df_3_clean['Fase'].astype(str)
-                # Contar encuentros únicos por respuesta considerando fase
-                conteo_por_pregunta = df_3_clean.groupby('respuesta')['Encuentro_Fase_Unico'].nunique().reset_index()
-            else:
-                # Fallback si no hay columna Fase
-                conteo_por_pregunta = df_3_clean.groupby('respuesta')['Encuentro'].nunique().reset_index()
-            
-            conteo_por_pregunta.columns = ['Respuesta', 'Numero_de_encuentros']
-            
-            # Función para tomar solo las primeras palabras
-            def primeras_palabras(texto, num_palabras=3):
-                palabras = texto.split()
-                if len(palabras) > num_palabras:
-                    return " ".join(palabras[:num_palabras]) + "..."
-                return texto
-            
-            # Aplicar función a las respuestas
-            conteo_por_pregunta['Respuesta_Corta'] = conteo_por_pregunta['Respuesta'].apply(lambda x: primeras_palabras(x, 3))
-            
-            # Ordenar por número de encuentros de mayor a menor
-            conteo_por_pregunta = conteo_por_pregunta.sort_values('Numero_de_encuentros', ascending=True)
+            conteo_por_pregunta = conteos_abiertas[categoria]
+            if conteo_por_pregunta.empty:
+                st.warning(f"No hay datos válidos después de filtrar por '{categoria}'.")
+                continue
             
             # Crear el gráfico de barras horizontal
             fig_condiciones = px.bar(
                 conteo_por_pregunta,
                 x='Numero_de_encuentros',
                 y='Respuesta_Corta',
-                title="Número de Encuentros por Debilidad",
+                title=f"Número de Encuentros por {etiqueta}",
                 labels={
                     'Numero_de_encuentros': 'Número de encuentros',
-                    'Respuesta_Corta': 'Debilidad'
+                    'Respuesta_Corta': etiqueta
                 },
                 color='Numero_de_encuentros',
                 color_continuous_scale=COLOR_PALETTE['blue_scale'],
@@ -876,7 +608,7 @@ def hallazgos_generales():
             
             fig_condiciones.update_layout(
                 height=400,  # Aumentar altura del gráfico
-                yaxis_title="Debilidades",
+                yaxis_title=etiqueta_plural,
                 xaxis_title="Número de encuentros",
                 showlegend=False,
                 font=dict(size=12),
@@ -923,26 +655,8 @@ def dashboard_actitudes_colaboracion_ampliado(df):
         st.error(f"Columnas faltantes en los datos: {missing_cols}")
         return
     
-    likert_mapping = {
-        'Totalmente en desacuerdo': 1,
-        'En desacuerdo': 2,
-        'Neutro': 3,
-        'De acuerdo': 4,
-        'Totalmente de acuerdo': 5
-    }
-    
-    df_q15 = df[q15_cols].copy()
-    
-    for col in q15_cols:
-        df_q15[col] = df_q15[col].map(likert_mapping)
-    
-    # Invertir preguntas negativas (Q15_9 y Q15_11)
-    if 'Q15_9' in df_q15.columns:
-        df_q15['Q15_9'] = 6 - df_q15['Q15_9']
-    if 'Q15_11' in df_q15.columns:
-        df_q15['Q15_11'] = 6 - df_q15['Q15_11']
-    
-    df_q15 = df_q15.dropna()
+    # Puntajes 1-5 de los bloques derivados una vez por versión (Q15_9 y Q15_11 ya invertidas)
+    df_q15 = bloque_numerico(df, 'Q15')[q15_cols].dropna()
     
     if df_q15.empty:
         st.warning("No hay datos válidos para mostrar.")
@@ -997,8 +711,8 @@ def dashboard_actitudes_colaboracion_ampliado(df):
     # Análisis de correlaciones
     st.subheader("🔗 Análisis de Correlaciones entre Actitudes")
     
-    # Matriz de correlación
-    corr_matrix = df_q15.corr()
+    # Matriz de correlación (por pares de casos completos, calculada una vez por versión)
+    corr_matrix = matrices_correlacion(df)['pearson'].loc[q15_cols, q15_cols]
     
     fig_heatmap = px.imshow(
         corr_matrix,
@@ -1028,29 +742,9 @@ def dashboard_comparativo_colaboracion(df):
         st.error(f"Datos faltantes. Q15: {missing_q15}, Q18: {missing_q18}")
         return
     
-    # Procesar datos Q15 (Actitudes)
-    likert_mapping = {
-        'Totalmente en desacuerdo': 1, 'En desacuerdo': 2, 'Neutro': 3, 'De acuerdo': 4, 'Totalmente de acuerdo': 5
-    }
-    
-    df_q15 = df[q15_cols].copy()
-    for col in q15_cols:
-        df_q15[col] = df_q15[col].map(likert_mapping)
-    
-    # Invertir preguntas negativas
-    if 'Q15_9' in df_q15.columns:
-        df_q15['Q15_9'] = 6 - df_q15['Q15_9']
-    if 'Q15_11' in df_q15.columns:
-        df_q15['Q15_11'] = 6 - df_q15['Q15_11']
-    
-    # Procesar datos Q18 (Prácticas)
-    freq_mapping = {
-        'Nunca': 1, 'Rara vez': 2, 'Ocasionalmente': 3, 'Frecuentemente': 4, 'Muy frecuentemente': 5
-    }
-    
-    df_q18 = df[q18_cols].copy()
-    for col in q18_cols:
-        df_q18[col] = df_q18[col].map(freq_mapping)
+    # Puntajes 1-5 de los bloques derivados una vez por versión (Q15_9 y Q15_11 ya invertidas)
+    df_q15 = bloque_numerico(df, 'Q15')[q15_cols]
+    df_q18 = bloque_numerico(df, 'Q18')[q18_cols]
     
     # Calcular promedios
     promedio_actitudes = df_q15.mean(axis=1)
@@ -1145,15 +839,7 @@ def dashboard_redes_colaboracion(df):
         st.error(f"Columnas faltantes: {missing_cols}")
         return
     
-    freq_mapping = {
-        'Nunca': 1, 'Rara vez': 2, 'Ocasionalmente': 3, 'Frecuentemente': 4, 'Muy frecuentemente': 5
-    }
-    
-    df_red = df[red_cols].copy()
-    for col in red_cols:
-        df_red[col] = df_red[col].map(freq_mapping)
-    
-    df_red = df_red.dropna()
+    df_red = bloque_numerico(df, 'Q18')[red_cols].dropna()
     
     if df_red.empty:
         st.warning("No hay datos válidos para redes.")
@@ -4,9 +4,15 @@ import plotly.express as px
 import plotly.graph_objects as go
 import numpy as np
 from actions.chart_actions import graficador
+from actions.pares_actions import (
+    resumen_bloque, margenes_error, matrices_correlacion, selector_segmento, filtrar_segmento,
+)
 from constants.footer_constants import FOOTER_HTML, IMAGENES_BASE64
 from constants.header_constants import header,  HIDE_STREAMLIT_STYLE, generar_css_personalizado
+from constants.schema_constants import BLOQUES_PARES
 from utils.chart_config import get_chart_config
+from utils.dataset_registry import cargar_dataset
+from utils.schema import etiquetas_si_no
 
 # ==========================================
 # CONFIGURACIÓN INICIAL
@@ -91,22 +97,20 @@ header()
 # ==========================================
 # CARGA DE DATOS
 # ==========================================
-# URL del CSV
-CSV_URL = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ5wKRchgokVXA_uIQuSDqQ4MxsPwkTuwrLLOCc7rjIIlVhfgR4MnAKGLY5u_Hucg/pub?output=csv"
+# La encuesta está registrada como "pares" en utils/dataset_registry.py;
+# el refrescador la mantiene al día en segundo plano y las recargas nunca esperan a la red
+df = cargar_dataset("pares")
 
-@st.cache_data(ttl=600)
-def load_data(file):
-    df = pd.read_csv(file)
-    df.columns = df.columns.str.strip()
-    return df
-
-df = load_data(CSV_URL)
+# Selector global de segmentos (barra lateral): los promedios por bloque salen del cubo
+# de agregados por segmento; el resto de la página usa las respuestas del segmento
+segmento = selector_segmento(df)
+df_segmento = filtrar_segmento(df, segmento)
 
 # ==========================================
 # FUNCIONES DE DASHBOARDS
 # ==========================================
 
-def dashboard_q19(df):
+def dashboard_q19(df, segmento=None):
     """
     Dashboard simplificado con métricas de las preguntas Q19_1 al Q19_7 (excepto Q19_4)
     - Analiza prácticas pedagógicas
@@ -131,22 +135,14 @@ def dashboard_q19(df):
         st.warning(f"Columnas no encontradas: {missing_cols}")
         return
     
-    # Procesar datos
-    df_q19 = df[q19_cols].copy()
-    
-    # Convertir "No conozco" a 0 y hacer numérico
-    for col in q19_cols:
-        df_q19[col] = df_q19[col].replace(['No conozco', 'No sé'], 0)
-        df_q19[col] = pd.to_numeric(df_q19[col], errors='coerce')
+    # Promedios sobre casos completos, actualizados solo con las filas nuevas de la hoja
+    total_respuestas, promedios, desviaciones = resumen_bloque(df, 'Q19', segmento)
     
-    df_q19 = df_q19.dropna()
-    
-    if df_q19.empty:
+    if total_respuestas == 0:
         st.warning("No hay datos válidos para Prácticas Pedagógicas.")
         return
     
     # Calcular métricas
-    promedios = df_q19.mean()
     promedio_general = promedios.mean()
     
     # Métricas principales
@@ -156,7 +152,7 @@ def dashboard_q19(df):
         st.metric("📈 Promedio General", f"{promedio_general:.2f}")
     
     with col2:
-        st.metric("📊 Total Respuestas", len(df_q19))
+        st.metric("📊 Total Respuestas", total_respuestas)
     
     with col3:
         mejor = promedios.idxmax()
@@ -165,9 +161,12 @@ def dashboard_q19(df):
     # Gráfico de barras
     st.subheader("📊 Promedios por Práctica")
     
+    error_superior, error_inferior = margenes_error(df, promedios, 'Q19', segmento)
     df_bar = pd.DataFrame({
         'Práctica': [q19_labels[col] for col in promedios.index],
-        'Promedio': promedios.values
+        'Promedio': promedios.values,
+        'Error_Superior': error_superior,
+        'Error_Inferior': error_inferior
     })
     
     fig_bar = px.bar(
@@ -177,7 +176,9 @@ def dashboard_q19(df):
         title="Prácticas Pedagógicas - Promedios",
         text='Promedio',
         color='Promedio',
-        color_continuous_scale=COLOR_PALETTE['blue_scale']
+        color_continuous_scale=COLOR_PALETTE['blue_scale'],
+        error_y='Error_Superior',
+        error_y_minus='Error_Inferior'
     )
     fig_bar.update_traces(texttemplate='%{text:.2f}', textposition='outside')
     fig_bar.update_layout(
@@ -192,11 +193,11 @@ def dashboard_q19(df):
         stats_df = pd.DataFrame({
             'Práctica': [q19_labels[col] for col in q19_cols],
             'Promedio': [f"{promedios[col]:.2f}" for col in q19_cols],
-            'Desv.Est.': [f"{df_q19[col].std():.2f}" for col in q19_cols]
+            'Desv.Est.': [f"{desviaciones[col]:.2f}" for col in q19_cols]
         })
         st.dataframe(stats_df, use_container_width=True)
 
-def dashboard_habilidades_pc(df):
+def dashboard_habilidades_pc(df, segmento=None):
     """
     Dashboard para Percepción de Habilidades PC (Q16)
     - Analiza la percepción de habilidades en Pensamiento Computacional
@@ -227,28 +228,13 @@ def dashboard_habilidades_pc(df):
         st.warning(f"Columnas no encontradas: {missing_cols}")
         return
     
-    # Mapeo de respuestas tipo Likert a números
-    likert_mapping = {
-        'Totalmente en desacuerdo': 1,
-        'En desacuerdo': 2,
-        'Neutro': 3,
-        'De acuerdo': 4,
-        'Totalmente de acuerdo': 5
-    }
-    
-    df_q16 = df[q16_cols].copy()
+    # Promedios Likert (1-5) sobre casos completos, actualizados de forma incremental
+    total_respuestas, promedios, _ = resumen_bloque(df, 'Q16', segmento)
     
-    # Convertir respuestas Likert a numérico
-    for col in q16_cols:
-        df_q16[col] = df_q16[col].map(likert_mapping)
-    
-    df_q16 = df_q16.dropna()
-    
-    if df_q16.empty:
+    if total_respuestas == 0:
         st.warning("No hay datos válidos para Habilidades PC.")
         return
     
-    promedios = df_q16.mean()
     promedio_general = promedios.mean()
     
     # Métricas principales
@@ -258,7 +244,7 @@ def dashboard_habilidades_pc(df):
         st.metric("📈 Promedio General", f"{promedio_general:.2f}/5")
     
     with col2:
-        st.metric("📊 Total Respuestas", len(df_q16))
+        st.metric("📊 Total Respuestas", total_respuestas)
     
     with col3:
         mejor = promedios.idxmax()
@@ -267,9 +253,12 @@ def dashboard_habilidades_pc(df):
     # Gráfico de barras horizontal para mejor visualización
     st.subheader("📊 Percepción de Habilidades (1-5)")
     
+    error_superior, error_inferior = margenes_error(df, promedios, 'Q16', segmento)
     df_bar = pd.DataFrame({
         'Habilidad': [q16_labels[col] for col in promedios.index],
-        'Promedio': promedios.values
+        'Promedio': promedios.values,
+        'Error_Superior': error_superior,
+        'Error_Inferior': error_inferior
     }).sort_values('Promedio', ascending=True)
     
     fig_bar = px.bar(
@@ -280,13 +269,15 @@ def dashboard_habilidades_pc(df):
         text='Promedio',
         color='Promedio',
         color_continuous_scale=COLOR_PALETTE['blue_scale'],
-        orientation='h'
+        orientation='h',
+        error_x='Error_Superior',
+        error_x_minus='Error_Inferior'
     )
     fig_bar.update_traces(texttemplate='%{text:.2f}', textposition='outside')
     fig_bar.update_layout(height=600, showlegend=False)
     st.plotly_chart(fig_bar, use_container_width=True, config=chart_config)
 
-def dashboard_colaboracion(df):
+def dashboard_colaboracion(df, segmento=None):
     """
     Dashboard para Trabajo Colaborativo (Q18)
     - Analiza frecuencia de actividades de colaboración
@@ -313,27 +304,13 @@ def dashboard_colaboracion(df):
         st.warning(f"Columnas no encontradas: {missing_cols}")
         return
     
-    # Mapeo de frecuencias
-    freq_mapping = {
-        'Nunca': 1,
-        'Rara vez': 2,
-        'Ocasionalmente': 3,
-        'Frecuentemente': 4,
-        'Muy frecuentemente': 5
-    }
-    
-    df_q18 = df[q18_cols].copy()
-    
-    for col in q18_cols:
-        df_q18[col] = df_q18[col].map(freq_mapping)
+    # Promedios de frecuencia (1-5) sobre casos completos, actualizados de forma incremental
+    total_respuestas, promedios, _ = resumen_bloque(df, 'Q18', segmento)
     
-    df_q18 = df_q18.dropna()
-    
-    if df_q18.empty:
+    if total_respuestas == 0:
         st.warning("No hay datos válidos para Colaboración.")
         return
     
-    promedios = df_q18.mean()
     promedio_general = promedios.mean()
     
     col1, col2, col3 = st.columns(3)
@@ -342,7 +319,7 @@ def dashboard_colaboracion(df):
         st.metric("📈 Promedio General", f"{promedio_general:.2f}/5")
     
     with col2:
-        st.metric("📊 Total Respuestas", len(df_q18))
+        st.metric("📊 Total Respuestas", total_respuestas)
     
     with col3:
         mejor = promedios.idxmax()
@@ -353,9 +330,33 @@ def dashboard_colaboracion(df):
     
     categories = [q18_labels[col] for col in q18_cols]
     values = [promedios[col] for col in q18_cols]
+    error_superior, error_inferior = margenes_error(df, promedios[q18_cols], 'Q18', segmento)
     
     fig_radar = go.Figure()
     
+    # Banda del intervalo de confianza: límite superior relleno hasta el inferior
+    # (ambos contornos se cierran repitiendo la primera categoría)
+    superior = np.array(values) + error_superior
+    inferior = np.array(values) - error_inferior
+    fig_radar.add_trace(go.Scatterpolar(
+        r=np.append(superior, superior[:1]),
+        theta=categories + categories[:1],
+        name='IC 95% superior',
+        line=dict(color=COLOR_PALETTE['primary'], width=1, dash='dot'),
+        hoverinfo='skip',
+        showlegend=False
+    ))
+    fig_radar.add_trace(go.Scatterpolar(
+        r=np.append(inferior, inferior[:1]),
+        theta=categories + categories[:1],
+        name='IC 95% inferior',
+        line=dict(color=COLOR_PALETTE['primary'], width=1, dash='dot'),
+        fill='tonext',
+        fillcolor=f"rgba({int(COLOR_PALETTE['primary'][1:3], 16)}, {int(COLOR_PALETTE['primary'][3:5], 16)}, {int(COLOR_PALETTE['primary'][5:7], 16)}, 0.15)",
+        hoverinfo='skip',
+        showlegend=False
+    ))
+    
     fig_radar.add_trace(go.Scatterpolar(
         r=values,
         theta=categories,
@@ -378,7 +379,7 @@ def dashboard_colaboracion(df):
     
     st.plotly_chart(fig_radar, use_container_width=True, config=chart_config)
 
-def dashboard_actitudes_colaboracion(df):
+def dashboard_actitudes_colaboracion(df, segmento=None):
     """
     Dashboard para Actitudes hacia la Colaboración (Q15)
     - Analiza actitudes y disposición hacia el trabajo colaborativo
@@ -406,32 +407,13 @@ def dashboard_actitudes_colaboracion(df):
         st.warning(f"Columnas no encontradas: {missing_cols}")
         return
     
-    likert_mapping = {
-        'Totalmente en desacuerdo': 1,
-        'En desacuerdo': 2,
-        'Neutro': 3,
-        'De acuerdo': 4,
-        'Totalmente de acuerdo': 5
-    }
-    
-    df_q15 = df[q15_cols].copy()
-    
-    for col in q15_cols:
-        df_q15[col] = df_q15[col].map(likert_mapping)
-    
-    # Invertir preguntas negativas (Q15_9 y Q15_11)
-    if 'Q15_9' in df_q15.columns:
-        df_q15['Q15_9'] = 6 - df_q15['Q15_9']
-    if 'Q15_11' in df_q15.columns:
-        df_q15['Q15_11'] = 6 - df_q15['Q15_11']
-    
-    df_q15 = df_q15.dropna()
+    # Promedios sobre casos completos; Q15_9 y Q15_11 (negativas) ya vienen invertidas
+    total_respuestas, promedios, _ = resumen_bloque(df, 'Q15', segmento)
     
-    if df_q15.empty:
+    if total_respuestas == 0:
         st.warning("No hay datos válidos para Actitudes.")
         return
     
-    promedios = df_q15.mean()
     promedio_general = promedios.mean()
     
     col1, col2, col3 = st.columns(3)
@@ -440,7 +422,7 @@ def dashboard_actitudes_colaboracion(df):
         st.metric("📈 Actitud General", f"{promedio_general:.2f}/5")
     
     with col2:
-        st.metric("📊 Total Respuestas", len(df_q15))
+        st.metric("📊 Total Respuestas", total_respuestas)
     
     with col3:
         mejor = promedios.idxmax()
@@ -449,9 +431,12 @@ def dashboard_actitudes_colaboracion(df):
     # Gráfico de barras
     st.subheader("📊 Actitudes hacia la Colaboración")
     
+    error_superior, error_inferior = margenes_error(df, promedios, 'Q15', segmento)
     df_bar = pd.DataFrame({
         'Actitud': [q15_labels[col] for col in promedios.index],
-        'Promedio': promedios.values
+        'Promedio': promedios.values,
+        'Error_Superior': error_superior,
+        'Error_Inferior': error_inferior
     }).sort_values('Promedio', ascending=False)
     
     fig_bar = px.bar(
@@ -461,7 +446,9 @@ def dashboard_actitudes_colaboracion(df):
         title="Actitudes hacia la Colaboración (1-5)",
         text='Promedio',
         color='Promedio',
-        color_continuous_scale=COLOR_PALETTE['blue_scale']
+        color_continuous_scale=COLOR_PALETTE['blue_scale'],
+        error_y='Error_Superior',
+        error_y_minus='Error_Inferior'
     )
     fig_bar.update_traces(texttemplate='%{text:.2f}', textposition='outside')
     fig_bar.update_layout(
@@ -471,7 +458,7 @@ def dashboard_actitudes_colaboracion(df):
     )
     st.plotly_chart(fig_bar, use_container_width=True, config=chart_config)
 
-def dashboard_estrategias_programacion(df):
+def dashboard_estrategias_programacion(df, segmento=None):
     """
     Dashboard para Estrategias de Programación (Q20)
     - Analiza estrategias de enseñanza específicas para programación
@@ -495,20 +482,13 @@ def dashboard_estrategias_programacion(df):
         st.warning(f"Columnas no encontradas: {missing_cols}")
         return
     
-    df_q20 = df[q20_cols].copy()
-    
-    # Convertir "No sé" a 0 y hacer numérico
-    for col in q20_cols:
-        df_q20[col] = df_q20[col].replace(['No sé', 'No conozco'], 0)
-        df_q20[col] = pd.to_numeric(df_q20[col], errors='coerce')
+    # Promedios (0-10) sobre casos completos, actualizados de forma incremental
+    total_respuestas, promedios, _ = resumen_bloque(df, 'Q20', segmento)
     
-    df_q20 = df_q20.dropna()
-    
-    if df_q20.empty:
+    if total_respuestas == 0:
         st.warning("No hay datos válidos para Estrategias de Programación.")
         return
     
-    promedios = df_q20.mean()
     promedio_general = promedios.mean()
     
     col1, col2, col3 = st.columns(3)
@@ -517,7 +497,7 @@ def dashboard_estrategias_programacion(df):
         st.metric("📈 Promedio General", f"{promedio_general:.2f}/10")
     
     with col2:
-        st.metric("📊 Total Respuestas", len(df_q20))
+        st.metric("📊 Total Respuestas", total_respuestas)
     
     with col3:
         mejor = promedios.idxmax()
@@ -526,9 +506,12 @@ def dashboard_estrategias_programacion(df):
     # Gráfico de barras
     st.subheader("📊 Frecuencia de Uso de Estrategias (1-10)")
     
+    error_superior, error_inferior = margenes_error(df, promedios, 'Q20', segmento)
     df_bar = pd.DataFrame({
         'Estrategia': [q20_labels[col] for col in promedios.index],
-        'Promedio': promedios.values
+        'Promedio': promedios.values,
+        'Error_Superior': error_superior,
+        'Error_Inferior': error_inferior
     }).sort_values('Promedio', ascending=False)
     
     fig_bar = px.bar(
@@ -538,7 +521,9 @@ def dashboard_estrategias_programacion(df):
         title="Estrategias de Enseñanza - Programación",
         text='Promedio',
         color='Promedio',
-        color_continuous_scale=COLOR_PALETTE['blue_scale']
+        color_continuous_scale=COLOR_PALETTE['blue_scale'],
+        error_y='Error_Superior',
+        error_y_minus='Error_Inferior'
     )
     fig_bar.update_traces(texttemplate='%{text:.2f}', textposition='outside')
     fig_bar.update_layout(
@@ -548,7 +533,7 @@ def dashboard_estrategias_programacion(df):
     )
     st.plotly_chart(fig_bar, use_container_width=True, config=chart_config)
 
-def dashboard_estrategias_pc(df):
+def dashboard_estrategias_pc(df, segmento=None):
     """
     Dashboard para Estrategias de Pensamiento Computacional (Q43)
     - Analiza estrategias específicas para enseñanza de PC
@@ -572,19 +557,12 @@ def dashboard_estrategias_pc(df):
         st.warning(f"Columnas no encontradas: {missing_cols}")
         return
     
-    df_q43 = df[q43_cols].copy()
+    total_respuestas, promedios, _ = resumen_bloque(df, 'Q43', segmento)
     
-    for col in q43_cols:
-        df_q43[col] = df_q43[col].replace(['No sé', 'No conozco'], 0)
-        df_q43[col] = pd.to_numeric(df_q43[col], errors='coerce')
-    
-    df_q43 = df_q43.dropna()
-    
-    if df_q43.empty:
+    if total_respuestas == 0:
         st.warning("No hay datos válidos para Estrategias PC.")
         return
     
-    promedios = df_q43.mean()
     promedio_general = promedios.mean()
     
     col1, col2, col3 = st.columns(3)
@@ -593,7 +571,7 @@ def dashboard_estrategias_pc(df):
         st.metric("📈 Promedio General", f"{promedio_general:.2f}/10")
     
     with col2:
-        st.metric("📊 Total Respuestas", len(df_q43))
+        st.metric("📊 Total Respuestas", total_respuestas)
     
     with col3:
         mejor = promedios.idxmax()
@@ -607,14 +585,9 @@ def dashboard_estrategias_pc(df):
     q20_available = all(col in df.columns for col in q20_cols)
     
     if q20_available:
-        df_q20 = df[q20_cols].copy()
-        for col in q20_cols:
-            df_q20[col] = df_q20[col].replace(['No sé', 'No conozco'], 0)
-            df_q20[col] = pd.to_numeric(df_q20[col], errors='coerce')
-        df_q20 = df_q20.dropna()
+        total_q20, promedios_q20, _ = resumen_bloque(df, 'Q20', segmento)
         
-        if not df_q20.empty:
-            promedios_q20 = df_q20.mean()
+        if total_q20 > 0:
             
             # Crear DataFrame para comparación
             comparison_data = []
@@ -627,6 +600,8 @@ def dashboard_estrategias_pc(df):
                 })
             
             df_comparison = pd.DataFrame(comparison_data)
+            error_sup_q20, error_inf_q20 = margenes_error(df, promedios_q20[q20_cols], 'Q20', segmento)
+            error_sup_q43, error_inf_q43 = margenes_error(df, promedios[q43_cols], 'Q43', segmento)
             
             fig_comparison = go.Figure()
             
@@ -634,14 +609,16 @@ def dashboard_estrategias_pc(df):
                 name='Programación',
                 x=df_comparison['Estrategia'],
                 y=df_comparison['Programación'],
-                marker_color=COLOR_PALETTE['primary']
+                marker_color=COLOR_PALETTE['primary'],
+                error_y=dict(type='data', array=error_sup_q20, arrayminus=error_inf_q20)
             ))
             
             fig_comparison.add_trace(go.Bar(
                 name='Pensamiento Computacional',
                 x=df_comparison['Estrategia'],
                 y=df_comparison['Pensamiento Computacional'],
-                marker_color=COLOR_PALETTE['secondary']
+                marker_color=COLOR_PALETTE['secondary'],
+                error_y=dict(type='data', array=error_sup_q43, arrayminus=error_inf_q43)
             ))
             
             fig_comparison.update_layout(
@@ -656,9 +633,12 @@ def dashboard_estrategias_pc(df):
             st.plotly_chart(fig_comparison, use_container_width=True, config=chart_config)
         else:
             # Solo mostrar PC si no hay datos de Q20
+            error_superior, error_inferior = margenes_error(df, promedios, 'Q43', segmento)
             df_bar = pd.DataFrame({
                 'Estrategia': [q43_labels[col] for col in promedios.index],
-                'Promedio': promedios.values
+                'Promedio': promedios.values,
+                'Error_Superior': error_superior,
+                'Error_Inferior': error_inferior
             })
             
             fig_bar = px.bar(
@@ -668,7 +648,9 @@ def dashboard_estrategias_pc(df):
                 title="Estrategias de Enseñanza - Pensamiento Computacional",
                 text='Promedio',
                 color='Promedio',
-                color_continuous_scale=COLOR_PALETTE['blue_scale']
+                color_continuous_scale=COLOR_PALETTE['blue_scale'],
+                error_y='Error_Superior',
+                error_y_minus='Error_Inferior'
             )
             fig_bar.update_traces(texttemplate='%{text:.2f}', textposition='outside')
             fig_bar.update_layout(
@@ -678,6 +660,46 @@ def dashboard_estrategias_pc(df):
             )
             st.plotly_chart(fig_bar, use_container_width=True, config=chart_config)
 
+def dashboard_correlaciones(df, segmento=None):
+    """
+    Explorador de correlaciones entre las preguntas de dos bloques cualesquiera
+    (Q15, Q16, Q18, Q19, Q20, Q43), con Pearson o Spearman
+    """
+    st.markdown("---")
+    st.header("🔗 Correlaciones entre Bloques")
+    
+    # Todas las matrices se calculan de una vez por versión de los datos y segmento
+    resultado = matrices_correlacion(df, segmento)
+    bloques = [bloque for bloque, cols in BLOQUES_PARES.items() if all(col in resultado['n'].index for col in cols)]
+    if not bloques:
+        st.warning("No hay bloques de preguntas disponibles para correlacionar.")
+        return
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        metodo = st.selectbox("Método", ['Pearson', 'Spearman'], key="correlaciones_metodo")
+    with col2:
+        bloque_filas = st.selectbox("Bloque (filas)", bloques, key="correlaciones_filas")
+    with col3:
+        bloque_columnas = st.selectbox("Bloque (columnas)", bloques, key="correlaciones_columnas")
+    
+    filas, columnas = BLOQUES_PARES[bloque_filas], BLOQUES_PARES[bloque_columnas]
+    corr_matrix = resultado[metodo.lower()].loc[filas, columnas]
+    casos = resultado['n'].loc[filas, columnas]
+    
+    fig_heatmap = px.imshow(
+        corr_matrix,
+        title=f"Correlación de {metodo}: {bloque_filas} vs {bloque_columnas}",
+        color_continuous_scale='RdBu',
+        zmin=-1,
+        zmax=1,
+        text_auto='.2f',
+        aspect="auto"
+    )
+    fig_heatmap.update_layout(height=600)
+    st.plotly_chart(fig_heatmap, use_container_width=True, config=chart_config)
+    st.caption(f"Cada par usa las respuestas que contestaron ambas preguntas (entre {casos.values.min()} y {casos.values.max()} casos).")
+
 def dashboard_conocimientos_pc(df):
     """
     Dashboard para Autorreporte de Conocimientos PC (Q22)
@@ -711,8 +733,8 @@ def dashboard_conocimientos_pc(df):
         st.warning(f"Columnas no encontradas: {missing_cols}")
         return
     
-    df_q22 = df[q22_cols].copy()
-    df_q22 = df_q22.dropna()
+    # Las respuestas vienen como booleanos (Sí = True) desde el esquema de carga
+    df_q22 = df[q22_cols].dropna()
     
     if df_q22.empty:
         st.warning("No hay datos válidos para Conocimientos PC.")
@@ -721,7 +743,7 @@ def dashboard_conocimientos_pc(df):
     # Calcular porcentajes de respuestas correctas
     porcentajes_correctos = {}
     for col in q22_cols:
-        respuesta_correcta = respuestas_correctas[col]
+        respuesta_correcta = respuestas_correctas[col] == 'Sí'
         total_respuestas = len(df_q22[col])
         respuestas_correctas_count = (df_q22[col] == respuesta_correcta).sum()
         porcentajes_correctos[col] = (respuestas_correctas_count / total_respuestas) * 100
@@ -774,8 +796,8 @@ def dashboard_conocimientos_pc(df):
     with st.expander("📋 Ver detalles por concepto"):
         detailed_stats = []
         for col in q22_cols:
-            si_count = (df_q22[col] == 'Sí').sum()
-            no_count = (df_q22[col] == 'No').sum()
+            si_count = int(df_q22[col].sum())
+            no_count = len(df_q22[col]) - si_count
             total = len(df_q22[col])
             
             detailed_stats.append({
@@ -806,21 +828,21 @@ def dashboard_demografia(df):
     
     with col2:
         if 'Q11' in df.columns:  # Sexo
-            sexo_dist = df['Q11'].value_counts()
+            sexo_dist = df['Q11'].value_counts()[lambda s: s > 0]
             sexo_mayoritario = sexo_dist.index[0] if len(sexo_dist) > 0 else "N/A"
             porcentaje = (sexo_dist.iloc[0] / total_participantes * 100) if len(sexo_dist) > 0 else 0
             st.metric("⚖️ Género Predominante", sexo_mayoritario, f"{porcentaje:.1f}%")
     
     with col3:
         if 'Q27' in df.columns:  # Formación TI
-            formacion_ti = df['Q27'].value_counts()
+            formacion_ti = etiquetas_si_no(df['Q27']).value_counts()[lambda s: s > 0]
             con_formacion = formacion_ti.get('Sí', 0)
             porcentaje_ti = (con_formacion / total_participantes * 100) if total_participantes > 0 else 0
             st.metric("💻 Con Formación TI", f"{porcentaje_ti:.1f}%", f"{con_formacion} docentes")
     
     with col4:
         if 'Q26' in df.columns:  # Nivel educativo
-            nivel_counts = df['Q26'].value_counts()
+            nivel_counts = df['Q26'].value_counts()[lambda s: s > 0]
             nivel_principal = nivel_counts.index[0] if len(nivel_counts) > 0 else "N/A"
             st.metric("🎓 Nivel Principal", nivel_principal[:12] + "...", f"{nivel_counts.iloc[0] if len(nivel_counts) > 0 else 0}")
     
@@ -830,7 +852,7 @@ def dashboard_demografia(df):
     with col_left:
         if 'Q11' in df.columns:
             st.subheader("👫 Distribución por Género")
-            sexo_counts = df['Q11'].value_counts()
+            sexo_counts = df['Q11'].value_counts()[lambda s: s > 0]
             if not sexo_counts.empty:
                 # Gráfico de barras horizontal para género
                 fig_sexo = px.bar(
@@ -853,7 +875,7 @@ def dashboard_demografia(df):
     with col_right:
         if 'Q27' in df.columns:  # Formación en TI
             st.subheader("💻 Formación en TI")
-            formacion_ti = df['Q27'].value_counts()
+            formacion_ti = etiquetas_si_no(df['Q27']).value_counts()[lambda s: s > 0]
             if not formacion_ti.empty:
                 # Gráfico de barras para formación TI
                 colors = ['lightgreen' if x == 'Sí' else 'lightcoral' for x in formacion_ti.index]
@@ -876,7 +898,7 @@ def dashboard_demografia(df):
     # Segunda fila - Nivel educativo
     if 'Q26' in df.columns:
         st.subheader("🎓 Niveles Educativos donde Enseñan")
-        nivel_counts = df['Q26'].value_counts()
+        nivel_counts = df['Q26'].value_counts()[lambda s: s > 0]
         if not nivel_counts.empty:
             # Gráfico de barras para nivel educativo
             fig_nivel = px.bar(
@@ -910,7 +932,7 @@ def dashboard_demografia(df):
         # Análisis de experiencia si existe alguna columna relacionada
         if 'Q25' in df.columns:  # Años de experiencia (si existe)
             st.subheader("📅 Experiencia Docente")
-            experiencia_counts = df['Q25'].value_counts().head(10)  # Top 10
+            experiencia_counts = df['Q25'].value_counts()[lambda s: s > 0].head(10)  # Top 10
             if not experiencia_counts.empty:
                 fig_exp = px.bar(
                     x=experiencia_counts.index,
@@ -932,7 +954,7 @@ def dashboard_demografia(df):
         resumen_data = []
         
         if 'Q11' in df.columns:
-            sexo_counts = df['Q11'].value_counts()
+            sexo_counts = df['Q11'].value_counts()[lambda s: s > 0]
             for genero, cantidad in sexo_counts.items():
                 resumen_data.append({
                     'Categoría': 'Género',
@@ -942,7 +964,7 @@ def dashboard_demografia(df):
                 })
         
         if 'Q27' in df.columns:
-            ti_counts = df['Q27'].value_counts()
+            ti_counts = etiquetas_si_no(df['Q27']).value_counts()[lambda s: s > 0]
             for respuesta, cantidad in ti_counts.items():
                 resumen_data.append({
                     'Categoría': 'Formación TI',
@@ -970,7 +992,7 @@ def dashboard_transferencia(df):
         return
     
     # Análisis de transferencia
-    transferencia_counts = df['Q36'].value_counts()
+    transferencia_counts = etiquetas_si_no(df['Q36']).value_counts()[lambda s: s > 0]
     total_respuestas = len(df['Q36'].dropna())
     
     if total_respuestas == 0:
@@ -990,8 +1012,8 @@ def dashboard_transferencia(df):
     with col3:
         # Estudiantes totales si hay datos
         if 'Q38' in df.columns and 'Q39' in df.columns:
-            hombres = pd.to_numeric(df['Q38'], errors='coerce').sum()
-            mujeres = pd.to_numeric(df['Q39'], errors='coerce').sum()
+            hombres = df['Q38'].sum()
+            mujeres = df['Q39'].sum()
             total_estudiantes = hombres + mujeres
             st.metric("👨‍🎓 Total Estudiantes", f"{int(total_estudiantes)}", f"H: {int(hombres)} | M: {int(mujeres)}")
     
@@ -1018,7 +1040,7 @@ def dashboard_transferencia(df):
             grados_data = []
             for col in available_grados:
                 if col in grados_labels:
-                    count = (df[col] == 'Sí').sum() if col in df.columns else 0
+                    count = int(df[col].sum()) if col in df.columns else 0
                     grados_data.append({'Grado': grados_labels[col], 'Cantidad': count})
             
             if grados_data:
@@ -1081,23 +1103,28 @@ def mostrar_paleta_colores():
 st.title("📚 Dashboard Integral - Codinghub Masters")
 
 # Mostrar todos los dashboards en la misma página
-dashboard_q19(df)
-dashboard_habilidades_pc(df)
-dashboard_colaboracion(df)
-dashboard_estrategias_programacion(df)
-dashboard_estrategias_pc(df)
-dashboard_conocimientos_pc(df)
-dashboard_demografia(df)
-dashboard_transferencia(df)
+dashboard_q19(df, segmento)
+dashboard_habilidades_pc(df, segmento)
+dashboard_colaboracion(df, segmento)
+dashboard_estrategias_programacion(df, segmento)
+dashboard_estrategias_pc(df, segmento)
+dashboard_correlaciones(df, segmento)
+if df_segmento.empty:
+    # Sin respuestas no hay nada que contar ni graficar fila a fila
+    st.warning("El segmento seleccionado no tiene respuestas. Ajusta los filtros de la barra lateral para ver conocimientos, demografía, transferencia y el graficador.")
+else:
+    dashboard_conocimientos_pc(df_segmento)
+    dashboard_demografia(df_segmento)
+    dashboard_transferencia(df_segmento)
 
-# ==========================================
-# GRAFICADOR PERSONALIZADO
-# ==========================================
-# Separador para el graficador
-st.markdown("---")
-st.header("🎨 Graficador Personalizado")
-st.write("Utiliza esta herramienta para crear gráficos personalizados con cualquier combinación de variables.")
-graficador(df, key_suffix="pares_expertos")
+    # ==========================================
+    # GRAFICADOR PERSONALIZADO
+    # ==========================================
+    # Separador para el graficador
+    st.markdown("---")
+    st.header("🎨 Graficador Personalizado")
+    st.write("Utiliza esta herramienta para crear gráficos personalizados con cualquier combinación de variables.")
+    graficador(df_segmento, key_suffix="pares_expertos")
 
 # ==========================================
 # INFORMACIÓN TÉCNICA
@@ -38,4 +38,31 @@ BARMODE_DICT = {
     "apilado": "stack",
     "superpuesto": "overlay",
     "relativo": "relative",
-}
\ No newline at end of file
+}
+
+# ==========================================
+# GRAFICADOR PERSONALIZADO
+# ==========================================
+# Gráficos (datos agregados + figura) que se guardan por especificación, para todas las sesiones
+MAX_GRAFICOS_EN_CACHE = 64
+
+# Modo de gran volumen para Dispersión y Línea: a partir de estas filas se agregan los
+# datos en el servidor y se dibuja con WebGL (el usuario puede pedir todos los puntos)
+UMBRAL_GRAN_VOLUMEN = 5000
+# Puntos que conserva cada serie de un gráfico de línea (LTTB)
+PUNTOS_POR_SERIE = 1000
+# Celdas por eje de la malla de densidad de los gráficos de dispersión
+CELDAS_DENSIDAD = 100
+
+# Histogramas y cajas se resumen en el servidor: intervalos máximos por histograma y
+# valores atípicos que se dibujan como mucho por caja
+MAX_BINS_HISTOGRAMA = 100
+MAX_ATIPICOS_POR_CAJA = 50
+
+# Tipos de gráfico que ofrece el graficador
+TIPOS_GRAFICO = ["Barras", "Dispersión", "Cajas", "Línea", "Histograma"]
+
+# Parámetro de la URL que guarda la especificación del gráfico (con el sufijo del graficador)
+# y su longitud máxima: más allá, navegadores y servidores pueden rechazar el enlace
+PARAMETRO_GRAFICO = "grafico"
+MAX_LONGITUD_ENLACE = 8000
@@ -0,0 +1,40 @@
+import os
+
+# Directorio raíz para los datos cacheados en disco (sobrevive reinicios del contenedor)
+CACHE_DIR = os.getenv("CODINGHUBS_CACHE_DIR", "./.cache")
+
+# Carpeta donde se guardan las instantáneas de las hojas de Google Sheets
+SNAPSHOT_DIR = os.path.join(CACHE_DIR, "snapshots")
+
+# Número de versiones anteriores que se conservan por cada fuente
+SNAPSHOT_MAX_VERSIONES = 3
+
+# Tiempo máximo de espera (segundos) al descargar una hoja publicada
+TIMEOUT_DESCARGA = 30
+
+# Tamaño (bytes) a partir del cual una descarga se guarda en disco en lugar de en memoria
+MAX_DESCARGA_EN_MEMORIA = 16 * 1024 * 1024
+
+# Filas que se leen por bloque al procesar exportaciones grandes de la encuesta
+FILAS_POR_BLOQUE_CSV = 5000
+
+# Versión del código de los lectores por bloques: súbela si cambia cómo se leen o
+# convierten las columnas, para que no se reutilicen instantáneas leídas con el anterior
+VERSION_LECTORES = 1
+
+# Cada cuánto (segundos) el refrescador en segundo plano vuelve a descargar cada hoja
+INTERVALO_REFRESCO = int(os.getenv("CODINGHUBS_INTERVALO_REFRESCO", "600"))
+
+# Hilos máximos dedicados a descargar hojas en segundo plano
+MAX_DESCARGAS_SIMULTANEAS = 8
+
+# Modo sin conexión (benchmarks y pruebas de carga): las hojas publicadas se resuelven
+# a un servidor local de datos de prueba (p. ej. http://localhost:8765) o a una carpeta con <nombre>.csv
+FIXTURES_URL = os.getenv("CODINGHUBS_FIXTURES_URL", "")
+FIXTURES_DIR = os.getenv("CODINGHUBS_FIXTURES_DIR", "")
+
+# Valores por defecto del servidor local de datos de prueba
+FIXTURES_PUERTO = 8765
+FIXTURES_FILAS = 2000
+FIXTURES_LATENCIA = 0.0
+FIXTURES_SEMILLA = 0
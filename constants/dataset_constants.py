@@ -0,0 +1,40 @@
+from pathlib import Path
+
+from constants.data_constants import FIXTURES_DIR, FIXTURES_URL
+
+# ==========================================
+# FUENTES DE DATOS (CSV publicados de Google Sheets)
+# ==========================================
+# Encuesta a los docentes de Codinghub Masters (página /pares)
+CSV_URL_PARES = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ5wKRchgokVXA_uIQuSDqQ4MxsPwkTuwrLLOCc7rjIIlVhfgR4MnAKGLY5u_Hucg/pub?output=csv"
+
+# Encuentros colaborativos (página /encuentros_colaborativos)
+CSV_URL_ENCUENTROS_MOMENTOS = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQzYORLJ_nV7qv_vP2hrWmdV8Sm2rOpQPSNH9WLKJkJoHyfIOgBsrJu-uh-6_MYDg/pub?output=csv"
+CSV_URL_ENCUENTROS_GENERO = "https://docs.google.com/spreadsheets/d/e/2PACX-1vT7ngk1_bT8zj18I7yzTKeI74316aXaUvKgyx8ww8OzjL0l1_1ewFwcJqW3hBFyuw/pub?output=csv"
+CSV_URL_ENCUENTROS_RESPUESTAS = "https://docs.google.com/spreadsheets/d/e/2PACX-1vSq4YCoKLIOBuBJGv-V4FwZLccdOOFYRjkrNsKrkME7tFeRSC15J2FFD2GjwgbwPg/pub?output=csv"
+
+# Nodos por componente (página de inicio)
+CSV_URL_NODOS_COMPONENTE_2 = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTlsF52R65CuvMIwgbz6Fb45XFoOGFDOwp1VhV7HYQZRJZHNZ4hloBxM2a2nkqt5zZO-31VLZuYo4aS/pub?output=csv"
+CSV_URL_NODOS_COMPONENTE_3 = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQpMuuFoZB22K2HPwON_RWbpW7sv2CSyHOG0XRkGXSwWIuTlMpJ7EGmLvJT0M1dGA/pub?output=csv"
+
+# Marco de calidad de las instituciones educativas
+CSV_URL_MARCO_CALIDAD = "https://docs.google.com/spreadsheets/d/e/2PACX-1vQ6Ql44xab2MHwi7PcPIa9nvMERf6oUTWktc5W6RG5KvhEP9SPPb_a638vdDPoWkTg_x8ovxt_RP9Xl/pub?output=csv"
+
+# Nombre de cada conjunto de datos -> URL publicada
+URLS_PUBLICADAS = {
+    "pares": CSV_URL_PARES,
+    "encuentros_momentos": CSV_URL_ENCUENTROS_MOMENTOS,
+    "encuentros_genero": CSV_URL_ENCUENTROS_GENERO,
+    "encuentros_respuestas": CSV_URL_ENCUENTROS_RESPUESTAS,
+    "nodos_componente_2": CSV_URL_NODOS_COMPONENTE_2,
+    "nodos_componente_3": CSV_URL_NODOS_COMPONENTE_3,
+    "marco_calidad": CSV_URL_MARCO_CALIDAD,
+}
+
+# Nombre de cada conjunto de datos -> URL de origen (en modo sin conexión, la copia local)
+if FIXTURES_URL:
+    DATASET_URLS = {nombre: f"{FIXTURES_URL.rstrip('/')}/{nombre}.csv" for nombre in URLS_PUBLICADAS}
+elif FIXTURES_DIR:
+    DATASET_URLS = {nombre: Path(FIXTURES_DIR, f"{nombre}.csv").resolve().as_uri() for nombre in URLS_PUBLICADAS}
+else:
+    DATASET_URLS = dict(URLS_PUBLICADAS)
@@ -0,0 +1,19 @@
+# Opción del selector de fase que incluye todas las fases
+TODAS_LAS_FASES = "Todas las fases"
+
+# Conductas que se analizan en los mapas de calor y gráficos de momentos
+CONDUCTAS_PERMITIDAS = ['Transferencia de la experticia', 'Instrucción centrada en el estudiante', 'Enfoque de género']
+
+# Una observación cuenta una sola vez por encuentro, tipo, momento y fase
+CLAVES_OBSERVACION = ['Encuentro', 'tipo', 'Número de momento', 'Fase']
+
+# Encuentros del programa: denominador del porcentaje de encuentros con cada conducta
+MAX_ENCUENTROS = 9
+
+# Preguntas abiertas de las respuestas de los encuentros: texto buscado en 'pregunta'
+# (sin distinguir mayúsculas) -> (etiqueta en singular, en plural)
+CATEGORIAS_ABIERTAS = {
+    'Fortaleza': ('Fortaleza', 'Fortalezas'),
+    'Condicion': ('Condición', 'Condiciones'),
+    'Debilidad': ('Debilidad', 'Debilidades'),
+}
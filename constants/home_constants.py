@@ -1,3 +1,5 @@
+from constants.dataset_constants import DATASET_URLS
+
 # Rutas de imágenes
 BANNER_IMG = "./assets/media_portada.png"
 IMG_COMPONENTE_1 = "./assets/creacion_guias.jpg"
@@ -18,6 +20,7 @@ como ¡pionero de la enseñanza del pensamiento computacional en Manizales! A
 continuación, se abordan las temáticas principales que le permitirán tener una
 base para la toma de decisiones en su sede educativa."""
 
-CSV_URL_COMPONENTE_2 = "https://docs.google.com/spreadsheets/d/e/2PACX-1vTlsF52R65CuvMIwgbz6Fb45XFoOGFDOwp1VhV7HYQZRJZHNZ4hloBxM2a2nkqt5zZO-31VLZuYo4aS/pub?output=csv"
-CSV_URL_COMPONENTE_3="https://docs.google.com/spreadsheets/d/e/2PACX-1vQpMuuFoZB22K2HPwON_RWbpW7sv2CSyHOG0XRkGXSwWIuTlMpJ7EGmLvJT0M1dGA/pub?output=csv"
+# Las URLs viven en el registro central de fuentes de datos
+CSV_URL_COMPONENTE_2 = DATASET_URLS["nodos_componente_2"]
+CSV_URL_COMPONENTE_3 = DATASET_URLS["nodos_componente_3"]
 NODOS_MAP_FILEPATH = './data/mapa/gieu/colombia_map.geojson'
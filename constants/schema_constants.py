@@ -0,0 +1,115 @@
+# ==========================================
+# ESCALAS DE RESPUESTA DE LA ENCUESTA
+# ==========================================
+# Escala Likert de acuerdo (Q15, Q16), de menor a mayor
+ESCALA_ACUERDO = [
+    'Totalmente en desacuerdo',
+    'En desacuerdo',
+    'Neutro',
+    'De acuerdo',
+    'Totalmente de acuerdo',
+]
+
+# Escala de frecuencia (Q18), de menor a mayor
+ESCALA_FRECUENCIA = [
+    'Nunca',
+    'Rara vez',
+    'Ocasionalmente',
+    'Frecuentemente',
+    'Muy frecuentemente',
+]
+
+# Respuestas que en las escalas de 0 a 10 equivalen a 0
+RESPUESTAS_NO_SABE = ['No conozco', 'No sé']
+
+# Respuestas de sí/no
+VALORES_SI_NO = {'Sí': True, 'Si': True, 'No': False}
+
+# ==========================================
+# ESQUEMA DE LA ENCUESTA DE PARES
+# ==========================================
+# (patrón de columna, tipo, escala). Tipos:
+#   likert     -> categórica ordenada con la escala indicada
+#   escala     -> entero pequeño (0-10), "No sé"/"No conozco" = 0
+#   si_no      -> booleano con nulos
+#   categoria  -> categórica sin orden
+#   conteo     -> entero pequeño con nulos
+ESQUEMA_PARES = [
+    (r'Q11', 'categoria', None),
+    (r'Q15_\d+', 'likert', ESCALA_ACUERDO),
+    (r'Q16_\d+', 'likert', ESCALA_ACUERDO),
+    (r'Q18_\d+', 'likert', ESCALA_FRECUENCIA),
+    (r'Q19_\d+', 'escala', None),
+    (r'Q20_\d+', 'escala', None),
+    (r'Q22_\d+', 'si_no', None),
+    (r'Q26', 'categoria', None),
+    (r'Q27', 'si_no', None),
+    (r'Q36', 'si_no', None),
+    (r'Q37_\d+', 'si_no', None),
+    (r'Q38', 'conteo', None),
+    (r'Q39', 'conteo', None),
+    (r'Q43_\d+', 'escala', None),
+    (r'Nodo', 'categoria', None),
+]
+
+# Columnas de la exportación de la encuesta que usan los tableros (patrones): preguntas
+# Q11 a Q43, identificadores de la respuesta y nodo
+COLUMNAS_PARES = [
+    r'Q(1[1-9]|[23]\d|4[0-3])(_\d+)?',
+    r'ResponseId',
+    r'RecordedDate',
+    r'Nodo',
+]
+
+# Columnas adicionales que ofrece el graficador de /pares: todas las preguntas cerradas y
+# los metadatos de la respuesta que se pueden graficar. No se leen los textos libres
+# (Qn_TEXT) ni los datos personales (IP, destinatario, ubicación)
+COLUMNAS_GRAFICADOR_PARES = [
+    r'Q\d+(_\d+)*',
+    r'StartDate',
+    r'EndDate',
+    r'Status',
+    r'Progress',
+    r'Duration \(in seconds\)',
+    r'Finished',
+    r'DistributionChannel',
+    r'UserLanguage',
+]
+
+# ==========================================
+# BLOQUES DE PREGUNTAS DE LA ENCUESTA DE PARES
+# ==========================================
+# Columnas de cada bloque que se resume con promedios (casos completos por bloque)
+BLOQUES_PARES = {
+    'Q15': [f'Q15_{i}' for i in range(1, 12)],
+    'Q16': [f'Q16_{i}' for i in range(1, 14)],
+    'Q18': [f'Q18_{i}' for i in range(1, 11)],
+    'Q19': ['Q19_1', 'Q19_2', 'Q19_3', 'Q19_5', 'Q19_6', 'Q19_7'],  # Q19_4 no se analiza
+    'Q20': [f'Q20_{i}' for i in range(1, 8)],
+    'Q43': [f'Q43_{i}' for i in range(1, 8)],
+}
+
+# Preguntas redactadas en negativo: se invierten (6 - valor) antes de promediar
+PREGUNTAS_INVERSAS = ['Q15_9', 'Q15_11']
+
+# Intervalos de confianza bootstrap de los promedios (percentil)
+BOOTSTRAP_REMUESTRAS = 10000
+NIVEL_CONFIANZA = 0.95
+
+# ==========================================
+# SEGMENTOS DE LA PÁGINA DE PARES
+# ==========================================
+# Columnas por las que se puede segmentar toda la página -> etiqueta del selector
+DIMENSIONES_SEGMENTO = {
+    'Q11': 'Género',
+    'Q26': 'Nivel educativo',
+    'Q27': 'Formación en TI',
+    'Nodo': 'Nodo',
+}
+
+# Nivel que agrupa las respuestas vacías de una dimensión
+ETIQUETA_SIN_RESPUESTA = 'Sin respuesta'
+
+# Parámetro de la URL que guarda el segmento, para que los enlaces compartidos de la
+# página (p. ej. un gráfico del graficador) se abran sobre las mismas respuestas
+PARAMETRO_SEGMENTO = "segmento"
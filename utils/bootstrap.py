@@ -0,0 +1,28 @@
+import numpy as np
+
+from constants.schema_constants import BOOTSTRAP_REMUESTRAS, NIVEL_CONFIANZA
+
+
+def intervalos_bootstrap(valores, remuestras=BOOTSTRAP_REMUESTRAS, confianza=NIVEL_CONFIANZA, semilla=0):
+    """
+    Intervalo bootstrap (percentil) del promedio de cada columna de `valores`: matriz
+    n x k de puntajes enteros no negativos (escalas 1-5 y 0-10), sin faltantes.
+    Remuestrear n respuestas con reemplazo equivale a sacar de una multinomial cuántas
+    veces aparece cada puntaje, así que todas las remuestras de todas las preguntas se
+    generan en una sola llamada (remuestras x k x puntajes), sin recorrer las filas.
+    Devuelve (inferior, superior), arrays de longitud k (NaN si no hay respuestas).
+    """
+    n, k = valores.shape
+    if n == 0 or k == 0:
+        return np.full(k, np.nan), np.full(k, np.nan)
+    puntajes = valores.astype(np.int64)
+    niveles = int(puntajes.max()) + 1
+    conteos = np.bincount(
+        (puntajes + np.arange(k) * niveles).ravel(), minlength=k * niveles
+    ).reshape(k, niveles)
+    rng = np.random.default_rng(semilla)
+    muestras = rng.multinomial(n, conteos / n, size=(remuestras, k))
+    medias = muestras @ np.arange(niveles, dtype=np.float64) / n
+    alfa = (1 - confianza) / 2
+    inferior, superior = np.quantile(medias, [alfa, 1 - alfa], axis=0)
+    return inferior, superior
@@ -0,0 +1,82 @@
+import numpy as np
+import pandas as pd
+
+
+def _numericos(serie):
+    """Valores float de una serie numérica (no booleana), o None si es categórica."""
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        return serie.to_numpy(dtype=np.float64, na_value=np.nan)
+    return None
+
+
+def bordes_bins(valores, max_bins):
+    """
+    Bordes de los intervalos del histograma, comunes a todos los grupos: uno por valor
+    si los datos son enteros con pocos valores (escalas Likert y 0-10), si no la regla
+    automática de NumPy con como mucho `max_bins` intervalos.
+    """
+    minimo, maximo = valores.min(), valores.max()
+    if np.all(valores == np.round(valores)) and maximo - minimo < max_bins:
+        return np.arange(minimo - 0.5, maximo + 1.5)
+    bordes = np.histogram_bin_edges(valores, bins='auto')
+    if len(bordes) > max_bins + 1:
+        bordes = np.linspace(minimo, maximo, max_bins + 1)
+    return bordes
+
+
+def resumen_histograma(df, x, grupos, max_bins):
+    """
+    Alturas del histograma de `x` por grupo (color y facetas): una fila por grupo e
+    intervalo (o categoría) con la columna 'Cuenta'. En x numérico, `x` es el centro del
+    intervalo y 'Ancho' su ancho.
+    """
+    claves = [col for col in dict.fromkeys(grupos) if col != x]
+    valores = _numericos(df[x])
+    if valores is None:
+        return df.groupby(claves + [x], observed=True, sort=False).size().reset_index(name='Cuenta')
+    validos = ~np.isnan(valores)
+    if not validos.any():
+        return pd.DataFrame(columns=claves + [x, 'Cuenta', 'Ancho'])
+    valores = valores[validos]
+    bordes = bordes_bins(valores, max_bins)
+    intervalo = np.clip(np.searchsorted(bordes, valores, side='right') - 1, 0, len(bordes) - 2)
+    conteos = (
+        df.loc[validos, claves].assign(_intervalo=intervalo)
+        .groupby(claves + ['_intervalo'], observed=True, sort=False).size().reset_index(name='Cuenta')
+    )
+    centros, anchos = (bordes[:-1] + bordes[1:]) / 2, np.diff(bordes)
+    conteos[x] = centros[conteos['_intervalo']]
+    conteos['Ancho'] = anchos[conteos['_intervalo']]
+    return conteos.drop(columns='_intervalo')
+
+
+def resumen_cajas(df, x, y, grupos, max_atipicos):
+    """
+    Estadísticos de caja de `y` por x y grupo, como los calcula Plotly: cuartiles
+    (interpolación lineal), bigotes en el dato más extremo dentro de 1.5 IQR y valores
+    atípicos fuera de ellos (como mucho `max_atipicos` por caja, los más alejados de la
+    mediana). Devuelve (cajas, atipicos); ambos tienen la columna 'Caja' que los une.
+    """
+    claves = list(dict.fromkeys([x] + list(grupos)))
+    df = df[df[y].notna()]
+    if df.empty:
+        columnas = claves + ['Caja', 'q1', 'mediana', 'q3', 'inferior', 'superior', 'n']
+        return pd.DataFrame(columns=columnas), pd.DataFrame(columns=claves + ['Caja', y])
+    caja = df.groupby(claves, observed=True, sort=False, dropna=False).ngroup().to_numpy()
+    valores = df[y].to_numpy(dtype=np.float64)
+    por_caja = pd.Series(valores).groupby(caja)
+    cuartiles = por_caja.quantile([0.25, 0.5, 0.75]).unstack()
+    q1, mediana, q3 = (cuartiles[q].to_numpy() for q in (0.25, 0.5, 0.75))
+    rango = q3 - q1
+    dentro = (valores >= (q1 - 1.5 * rango)[caja]) & (valores <= (q3 + 1.5 * rango)[caja])
+
+    cajas = df[claves].assign(Caja=caja).drop_duplicates('Caja').sort_values('Caja').reset_index(drop=True)
+    cajas['q1'], cajas['mediana'], cajas['q3'] = q1, mediana, q3
+    cajas['inferior'] = pd.Series(np.where(dentro, valores, np.inf)).groupby(caja).min().to_numpy()
+    cajas['superior'] = pd.Series(np.where(dentro, valores, -np.inf)).groupby(caja).max().to_numpy()
+    cajas['n'] = por_caja.size().to_numpy()
+
+    atipicos = df.loc[~dentro, claves + [y]].assign(Caja=caja[~dentro])
+    distancia = np.abs(atipicos[y].to_numpy() - mediana[atipicos['Caja'].to_numpy()])
+    atipicos = atipicos.iloc[np.argsort(-distancia, kind='stable')].groupby('Caja').head(max_atipicos)
+    return cajas, atipicos
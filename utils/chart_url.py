@@ -0,0 +1,25 @@
+import base64
+import json
+import zlib
+
+
+def codificar_spec(spec):
+    """
+    Especificación de un gráfico como texto apto para la URL: JSON sin los campos vacíos,
+    comprimido y en base64 (las tuplas viajan como listas).
+    """
+    datos = {campo: valor for campo, valor in spec.items() if valor is not None}
+    texto = json.dumps(datos, ensure_ascii=False, separators=(',', ':'), default=str)
+    return base64.urlsafe_b64encode(zlib.compress(texto.encode('utf-8'))).decode('ascii').rstrip('=')
+
+
+def decodificar_spec(texto):
+    """Especificación guardada por `codificar_spec` ({campo: valor}). ValueError si el texto no es válido."""
+    try:
+        datos = zlib.decompress(base64.urlsafe_b64decode(texto + '=' * (-len(texto) % 4)))
+        spec = json.loads(datos.decode('utf-8'))
+    except zlib.error as error:
+        raise ValueError("Especificación de gráfico no válida") from error
+    if not isinstance(spec, dict):
+        raise ValueError("Especificación de gráfico no válida")
+    return spec
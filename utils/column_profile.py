@@ -0,0 +1,46 @@
+import numpy as np
+import pandas as pd
+
+from utils.figure_cache import CacheLRU, huella_datos
+
+# Perfiles ya calculados: (huella de los datos, columna) -> PerfilColumna
+MAX_PERFILES = 512
+_perfiles = CacheLRU(MAX_PERFILES)
+
+
+class PerfilColumna:
+    """
+    Resumen de una columna para los widgets: tipo, si se trata como numérica (las de
+    sí/no no), mínimo y máximo, valores distintos en orden de aparición con su conteo,
+    y número de respuestas vacías.
+    """
+
+    def __init__(self, serie):
+        self.dtype = serie.dtype
+        self.numerica = pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie)
+        codigos, unicos = pd.factorize(serie, use_na_sentinel=True)
+        validos = codigos[codigos >= 0]
+        self.valores = unicos.tolist()
+        self.conteos = dict(zip(self.valores, np.bincount(validos, minlength=len(self.valores)).tolist()))
+        self.nulos = len(serie) - len(validos)
+        self.minimo = self.maximo = None
+        if self.numerica and len(validos):
+            self.minimo, self.maximo = float(serie.min()), float(serie.max())
+
+    def conteo(self, valor):
+        """Número de respuestas con `valor` (0 si no aparece)."""
+        return self.conteos.get(valor, 0)
+
+
+def perfil_columna(df, col):
+    """
+    Perfil de la columna `col`. Con datos versionados se guarda por huella de los datos
+    (versión, columnas y filas), así que un segmento o filtro que vuelve a aparecer, en
+    esta u otra sesión, reutiliza el mismo perfil. KeyError si la columna no existe.
+    """
+    if col not in df.columns:
+        raise KeyError(col)
+    huella = huella_datos(df)
+    if huella is None:
+        return PerfilColumna(df[col])
+    return _perfiles.obtener((huella, col), lambda: PerfilColumna(df[col]))
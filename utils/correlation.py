@@ -0,0 +1,69 @@
+import numpy as np
+import pandas as pd
+
+# Filas por bloque al acumular la tabla de contingencia conjunta
+FILAS_POR_BLOQUE = 20000
+
+
+def _contingencia(puntajes, presentes, niveles):
+    """
+    Conteos conjuntos N[i, v, j, w] = respuestas con la pregunta i en v y la j en w,
+    acumulados por bloques de filas como producto de matrices indicadoras.
+    """
+    n, k = puntajes.shape
+    conjunta = np.zeros((k * niveles, k * niveles), dtype=np.float64)
+    desplazamiento = np.arange(k) * niveles
+    for inicio in range(0, n, FILAS_POR_BLOQUE):
+        fin = min(inicio + FILAS_POR_BLOQUE, n)
+        filas, cols = np.nonzero(presentes[inicio:fin])
+        indicadora = np.zeros((fin - inicio, k * niveles), dtype=np.float32)
+        indicadora[filas, puntajes[inicio:fin][filas, cols] + desplazamiento[cols]] = 1
+        conjunta += indicadora.T @ indicadora
+    return conjunta.reshape(k, niveles, k, niveles)
+
+
+def _correlacion(conjunta, marginal, puntaje):
+    """
+    Correlación de Pearson por pares a partir de los conteos conjuntos: `puntaje[i, v, j]`
+    es el valor asignado al nivel v de la pregunta i dentro de los casos comunes con j.
+    """
+    n = marginal.sum(axis=1)
+    suma = np.einsum('ivj,ivj->ij', marginal, puntaje)
+    suma_cuadrados = np.einsum('ivj,ivj->ij', marginal, puntaje ** 2)
+    producto = np.einsum('ivjw,ivj,jwi->ij', conjunta, puntaje, puntaje)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (n * producto - suma * suma.T) / np.sqrt(
+            (n * suma_cuadrados - suma ** 2) * (n * suma_cuadrados.T - suma.T ** 2)
+        )
+
+
+def correlaciones(valores, columnas):
+    """
+    Matrices de correlación de Pearson y de Spearman entre todas las columnas de `valores`
+    (puntajes enteros no negativos, NaN = sin respuesta), cada par sobre los casos que
+    respondieron ambas preguntas, como hacen `DataFrame.corr` por defecto.
+    Como los puntajes son discretos, todo sale de una sola tabla de contingencia conjunta:
+    los rangos de Spearman (promedio en empates) se obtienen de las frecuencias de cada
+    nivel dentro de los casos comunes, sin ordenar las respuestas de cada par.
+    Devuelve {'pearson': DataFrame, 'spearman': DataFrame, 'n': DataFrame de casos comunes}.
+    """
+    presentes = ~np.isnan(valores)
+    puntajes = np.where(presentes, valores, 0).astype(np.int64)
+    k = len(columnas)
+    niveles = int(puntajes.max()) + 1 if puntajes.size else 1
+    conjunta = _contingencia(puntajes, presentes, niveles)
+    # Frecuencias de cada nivel de i dentro de los casos comunes con j: marginal[i, v, j]
+    marginal = conjunta.sum(axis=3)
+
+    nivel = np.broadcast_to(np.arange(niveles, dtype=np.float64)[None, :, None], marginal.shape)
+    acumulado = np.cumsum(marginal, axis=1)
+    rango = acumulado - marginal + (marginal + 1) / 2
+
+    def como_frame(matriz):
+        return pd.DataFrame(matriz, index=columnas, columns=columnas)
+
+    return {
+        'pearson': como_frame(_correlacion(conjunta, marginal, nivel)),
+        'spearman': como_frame(_correlacion(conjunta, marginal, rango)),
+        'n': como_frame(marginal.sum(axis=1).astype(np.int64)),
+    }
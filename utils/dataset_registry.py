@@ -0,0 +1,117 @@
+import hashlib
+import logging
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pandas as pd
+
+from constants.data_constants import FILAS_POR_BLOQUE_CSV, VERSION_LECTORES
+from constants.dataset_constants import DATASET_URLS
+from constants.schema_constants import COLUMNAS_PARES, COLUMNAS_GRAFICADOR_PARES, ESQUEMA_PARES
+from utils.schema import aplicar_esquema
+from utils.sheet_refresher import registrar_fuente, obtener_datos
+
+logger = logging.getLogger(__name__)
+
+
+def leer_csv_utf8(buffer):
+    return pd.read_csv(buffer, encoding="utf-8")
+
+
+def lector_por_bloques(columnas, esquema=None, filas_por_bloque=FILAS_POR_BLOQUE_CSV):
+    """
+    Crea una función de lectura que recorre el CSV por bloques de filas, conserva solo
+    las columnas que coinciden con los patrones de `columnas` y convierte cada bloque al
+    esquema de tipos compactos. Así la memoria usada depende del tamaño del bloque y de las
+    columnas declaradas, no de todas las columnas de la exportación.
+    """
+    def usar_columna(col):
+        return any(re.fullmatch(patron, col.strip()) for patron in columnas)
+
+    def leer(buffer):
+        bloques = []
+        for bloque in pd.read_csv(buffer, usecols=usar_columna, chunksize=filas_por_bloque):
+            bloque.columns = bloque.columns.str.strip()
+            bloques.append(bloque if esquema is None else aplicar_esquema(bloque, esquema))
+        if not bloques:
+            return pd.DataFrame()
+        df = pd.concat(bloques, ignore_index=True)
+        # Las categorías pueden variar entre bloques: se unifican sobre el resultado
+        return df if esquema is None else aplicar_esquema(df, esquema)
+
+    return leer
+
+
+def huella_lector(columnas, esquema=None):
+    """
+    Huella de un lector por bloques: cambia si cambian las columnas declaradas, el esquema
+    de tipos o VERSION_LECTORES. Forma parte de la versión de las instantáneas en disco.
+    """
+    texto = repr((VERSION_LECTORES, list(columnas), esquema))
+    return hashlib.sha1(texto.encode("utf-8")).hexdigest()[:8]
+
+
+# Registro central: nombre -> URL, función de lectura y esquema de tipos (opcional)
+DATASETS = {
+    "pares": {
+        "url": DATASET_URLS["pares"],
+        "leer": lector_por_bloques(COLUMNAS_PARES + COLUMNAS_GRAFICADOR_PARES, ESQUEMA_PARES),
+        "esquema": ESQUEMA_PARES,
+        "lector": huella_lector(COLUMNAS_PARES + COLUMNAS_GRAFICADOR_PARES, ESQUEMA_PARES),
+    },
+    "encuentros_momentos": {"url": DATASET_URLS["encuentros_momentos"], "leer": leer_csv_utf8},
+    "encuentros_genero": {"url": DATASET_URLS["encuentros_genero"], "leer": leer_csv_utf8},
+    "encuentros_respuestas": {"url": DATASET_URLS["encuentros_respuestas"], "leer": leer_csv_utf8},
+    "nodos_componente_2": {"url": DATASET_URLS["nodos_componente_2"], "leer": pd.read_csv},
+    "nodos_componente_3": {"url": DATASET_URLS["nodos_componente_3"], "leer": pd.read_csv},
+    "marco_calidad": {"url": DATASET_URLS["marco_calidad"], "leer": pd.read_csv},
+}
+
+
+def _preparador(esquema):
+    if esquema is None:
+        return None
+    return lambda df: aplicar_esquema(df, esquema)
+
+
+for _dataset in DATASETS.values():
+    registrar_fuente(_dataset["url"], _dataset["leer"], _preparador(_dataset.get("esquema")), _dataset.get("lector"))
+
+_prefetch_lanzado = False
+_lock_prefetch = threading.Lock()
+
+
+def url_dataset(nombre):
+    """URL de origen del conjunto de datos `nombre`."""
+    return DATASETS[nombre]["url"]
+
+
+def cargar_dataset(nombre):
+    """Devuelve el último DataFrame disponible del conjunto de datos `nombre`."""
+    dataset = DATASETS[nombre]
+    return obtener_datos(dataset["url"], dataset["leer"])
+
+
+def prefetch_datasets():
+    """
+    Carga todos los conjuntos de datos en paralelo, una sola vez por proceso.
+    No bloquea: las páginas que pidan un conjunto aún en descarga
+    se unen a esa misma descarga en lugar de lanzar otra.
+    """
+    global _prefetch_lanzado
+    with _lock_prefetch:
+        if _prefetch_lanzado:
+            return
+        _prefetch_lanzado = True
+
+    def cargar(nombre):
+        try:
+            cargar_dataset(nombre)
+        except Exception as e:
+            logger.warning("No se pudo precargar '%s': %s", nombre, e)
+
+    executor = ThreadPoolExecutor(max_workers=len(DATASETS), thread_name_prefix="prefetch")
+    for nombre in DATASETS:
+        executor.submit(cargar, nombre)
+    executor.shutdown(wait=False)
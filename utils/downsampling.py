@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+
+
+def lttb(x, y, puntos):
+    """
+    Largest-Triangle-Three-Buckets: posiciones de `puntos` muestras de la serie (x ordenado)
+    que conservan su forma visual. Siempre incluye el primer y el último punto.
+    """
+    n = len(x)
+    if puntos >= n or puntos < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # Cubetas del interior (sin el primer ni el último punto)
+    limites = np.linspace(1, n - 1, puntos - 1).astype(np.int64)
+    elegidos = np.empty(puntos, dtype=np.int64)
+    elegidos[0], elegidos[-1] = 0, n - 1
+    anterior = 0
+    for i in range(puntos - 2):
+        inicio, fin = limites[i], limites[i + 1]
+        # Promedio de la cubeta siguiente (o el último punto)
+        siguiente_fin = limites[i + 2] if i + 2 < len(limites) else n
+        siguiente_inicio = fin if i + 2 < len(limites) else n - 1
+        x_medio = x[siguiente_inicio:siguiente_fin].mean()
+        y_medio = y[siguiente_inicio:siguiente_fin].mean()
+        # Punto de la cubeta que forma el triángulo de mayor área con el anterior y ese promedio
+        areas = np.abs(
+            (x[anterior] - x_medio) * (y[inicio:fin] - y[anterior])
+            - (x[anterior] - x[inicio:fin]) * (y_medio - y[anterior])
+        )
+        anterior = inicio + int(np.argmax(areas)) if fin > inicio else inicio
+        elegidos[i + 1] = anterior
+    return elegidos
+
+
+def _como_numero(serie):
+    """Valores numéricos de una serie (fechas como enteros) o None si no se puede ordenar en un eje."""
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        return serie.astype('int64').to_numpy(dtype=np.float64)
+    if pd.api.types.is_numeric_dtype(serie) and not pd.api.types.is_bool_dtype(serie):
+        return serie.to_numpy(dtype=np.float64, na_value=np.nan)
+    return None
+
+
+def reducir_lineas(df, x, y, grupos, puntos):
+    """
+    Cada serie (combinación de `grupos`) ordenada por x y reducida con LTTB a `puntos`.
+    Si x no es numérico ni fecha, el DataFrame se devuelve igual.
+    """
+    if _como_numero(df[x]) is None:
+        return df
+    df = df.dropna(subset=[x, y]).sort_values(x, kind='stable')
+    valores_x, valores_y = _como_numero(df[x]), df[y].to_numpy(dtype=np.float64, na_value=np.nan)
+    grupos = list(dict.fromkeys(grupos))
+    series = df.groupby(grupos, sort=False, dropna=False).indices.values() if grupos else [np.arange(len(df))]
+    posiciones = np.concatenate([fila[lttb(valores_x[fila], valores_y[fila], puntos)] for fila in series])
+    return df.iloc[np.sort(posiciones)]
+
+
+def reducir_dispersion(df, x, y, grupos, celdas):
+    """
+    Densidad: los puntos de cada grupo se agrupan en una malla de `celdas` x `celdas`
+    (los ejes categóricos se agrupan por valor) y cada celda ocupa un solo punto, en el
+    promedio de sus puntos, con el número de puntos en la columna 'Puntos'.
+    """
+    df = df.dropna(subset=[x, y])
+    claves, columnas = list(dict.fromkeys(grupos)), {}
+    for eje in (x, y):
+        if eje in claves:
+            continue
+        valores = _como_numero(df[eje])
+        if valores is None:
+            claves.append(eje)
+            continue
+        minimo, maximo = np.nanmin(valores, initial=np.inf), np.nanmax(valores, initial=-np.inf)
+        ancho = (maximo - minimo) / celdas if maximo > minimo else 1.0
+        columnas[f'_celda_{eje}'] = np.minimum(((valores - minimo) // ancho).astype(np.int64), celdas - 1)
+        claves.append(f'_celda_{eje}')
+    agrupado = df.assign(**columnas).groupby(claves, sort=False, dropna=False, observed=True)
+    medias = {eje: (eje, 'mean') for eje in (x, y) if eje not in claves}
+    resumen = agrupado.agg(**medias, Puntos=(y if y not in claves else x, 'size')).reset_index()
+    return resumen.drop(columns=[col for col in columnas])
@@ -0,0 +1,80 @@
+import threading
+import weakref
+from collections import OrderedDict
+
+import pandas as pd
+
+
+class CacheLRU:
+    """
+    Caché acotada compartida por todas las sesiones del proceso: al llenarse descarta
+    la entrada usada hace más tiempo. Los valores se comparten, no deben modificarse.
+    """
+
+    def __init__(self, max_entradas):
+        self.max_entradas = max_entradas
+        self._entradas = OrderedDict()
+        self._lock = threading.Lock()
+
+    def obtener(self, clave, construir):
+        """Valor guardado para `clave`, o `construir()` (que se guarda) si no está."""
+        with self._lock:
+            if clave in self._entradas:
+                self._entradas.move_to_end(clave)
+                return self._entradas[clave]
+        valor = construir()
+        with self._lock:
+            self._entradas[clave] = valor
+            self._entradas.move_to_end(clave)
+            while len(self._entradas) > self.max_entradas:
+                self._entradas.popitem(last=False)
+        return valor
+
+    def __contains__(self, clave):
+        with self._lock:
+            return clave in self._entradas
+
+    def __len__(self):
+        return len(self._entradas)
+
+
+# Hash de cada índice ya visto: id(índice) -> (referencia débil al índice, hash). La entrada
+# desaparece con el índice, así que un id reutilizado no hereda el hash de otro
+_huellas_indice = {}
+_lock_huellas = threading.Lock()
+
+
+def _olvidar_indice(clave, referencia):
+    with _lock_huellas:
+        if _huellas_indice.get(clave, (None,))[0] is referencia:
+            del _huellas_indice[clave]
+
+
+def _huella_indice(index):
+    """
+    Identifica las filas de un DataFrame por su índice. Un RangeIndex se describe por sus
+    límites; cualquier otro índice se recorre una sola vez por objeto.
+    """
+    if isinstance(index, pd.RangeIndex):
+        return "rango", index.start, index.stop, index.step
+    clave = id(index)
+    with _lock_huellas:
+        entrada = _huellas_indice.get(clave)
+    if entrada is not None and entrada[0]() is index:
+        return entrada[1]
+    valor = int(pd.util.hash_pandas_object(index, index=False).sum()) if len(index) else 0
+    referencia = weakref.ref(index, lambda referencia, clave=clave: _olvidar_indice(clave, referencia))
+    with _lock_huellas:
+        _huellas_indice[clave] = (referencia, valor)
+    return valor
+
+
+def huella_datos(df):
+    """
+    Identifica el contenido de un DataFrame compartido: versión de los datos, columnas y
+    filas (un segmento o filtro de la misma versión tiene otro índice). None sin versión.
+    """
+    version = df.attrs.get("version")
+    if version is None:
+        return None
+    return version, tuple(df.columns), len(df), _huella_indice(df.index)
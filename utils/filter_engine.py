@@ -0,0 +1,36 @@
+import numpy as np
+
+from utils.figure_cache import CacheLRU, huella_datos
+
+# Máscaras por columna ya calculadas: (huella de los datos, columna, tipo, selección) -> array bool
+MAX_MASCARAS = 256
+_mascaras = CacheLRU(MAX_MASCARAS)
+
+
+def _mascara(df, col, tipo, seleccion):
+    """Máscara de un filtro: ('rango', (min, max)) para numéricas o ('valores', valores) para categóricas."""
+    if tipo == 'rango':
+        return df[col].between(seleccion[0], seleccion[1]).fillna(False).to_numpy(dtype=bool)
+    return df[col].isin(list(seleccion)).to_numpy(dtype=bool)
+
+
+def mascara_filtros(df, filtros):
+    """
+    Combina todos los filtros [(columna, tipo, selección)] en una sola máscara. Con datos
+    versionados la máscara de cada columna se guarda por selección, así que cambiar un
+    filtro solo recalcula esa columna y el resto se combina con un AND de NumPy.
+    """
+    huella = huella_datos(df) if filtros else None
+    mascara = np.ones(len(df), dtype=bool)
+    for col, tipo, seleccion in filtros:
+        if huella is None:
+            mascara &= _mascara(df, col, tipo, seleccion)
+        else:
+            mascara &= _mascaras.obtener((huella, col, tipo, seleccion), lambda: _mascara(df, col, tipo, seleccion))
+    return mascara
+
+
+def filtrar(df, filtros):
+    """Filas que cumplen todos los filtros: una sola selección (o el mismo DataFrame si nada se descarta)."""
+    mascara = mascara_filtros(df, filtros)
+    return df if mascara.all() else df[mascara]
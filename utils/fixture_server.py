@@ -0,0 +1,240 @@
+"""
+Servidor local de datos de prueba: reemplaza las hojas publicadas de Google Sheets
+para medir la ingesta y el renderizado sin red.
+
+Uso:
+    python -m utils.fixture_server --filas 5000 --latencia 0.5
+    CODINGHUBS_FIXTURES_URL=http://localhost:8765 streamlit run app.py
+
+Cada conjunto se sirve en /<nombre>.csv. Los parámetros ?filas=, ?latencia= y ?semilla=
+cambian el tamaño, la espera y el contenido de una petición concreta. Las filas de una
+misma semilla son estables: pedir más filas equivale a agregar filas al final de la hoja.
+"""
+import argparse
+import functools
+import os
+import threading
+import time
+import zlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+import pandas as pd
+
+from constants.data_constants import FIXTURES_FILAS, FIXTURES_LATENCIA, FIXTURES_PUERTO, FIXTURES_SEMILLA
+from constants.encuentros_constants import CONDUCTAS_PERMITIDAS
+from constants.marco_constants import MAPPING
+from constants.schema_constants import ESCALA_ACUERDO, ESCALA_FRECUENCIA, RESPUESTAS_NO_SABE
+
+DEPARTAMENTOS = [
+    'Atlántico', 'Bolívar', 'Magdalena', 'Cesar', 'Córdoba', 'Sucre', 'La Guajira',
+    'Antioquia', 'Cundinamarca', 'Santander', 'Valle del Cauca', 'Nariño',
+]
+FASES = ['Fase 1', 'Fase 2']
+ENCUENTROS = [f'Encuentro {i}' for i in range(1, 10)]
+TIPOS_CONDUCTA = ['Modelado', 'Andamiaje', 'Preguntas abiertas', 'Trabajo colaborativo', 'Lenguaje inclusivo']
+PARTICIPANTES = ['Docente', 'Estudiante']
+PREGUNTAS_ABIERTAS = ['Fortaleza del encuentro', 'Condicion para el aprendizaje', 'Debilidad observada']
+RESPUESTAS_ABIERTAS = [
+    'Buena disposición de los participantes',
+    'Uso adecuado de los recursos tecnológicos',
+    'Conectividad limitada en la sede',
+    'Tiempo insuficiente para las actividades',
+    'Acompañamiento constante del mentor',
+    'Participación activa de los estudiantes',
+]
+DIMENSIONES_MARCO = [
+    'Liderazgo y visión', 'Plan de estudios', 'Enseñanza, aprendizaje y evaluación',
+    'Desarrollo profesional docente', 'Equidad, diversidad e inclusión',
+    'Proyección en educación terciaria', 'Impacto en los resultados', 'Equidad de género',
+]
+
+
+def _columna(semilla, nombre, valores, filas, nulos=0.0):
+    """
+    Valores aleatorios de una columna. Cada columna tiene su propio generador,
+    así las primeras filas no cambian al pedir más filas.
+    """
+    rng = np.random.default_rng([semilla, zlib.crc32(nombre.encode("utf-8"))])
+    columna = rng.choice(np.array(valores, dtype=object), filas)
+    if nulos:
+        columna[rng.random(filas) < nulos] = None
+    return columna
+
+
+def _pares(filas, semilla):
+    escala_0_10 = [str(x) for x in range(0, 11)]
+    datos = {'Q11': _columna(semilla, 'Q11', ['Femenino', 'Masculino', 'Prefiero no decirlo'], filas)}
+    for i in range(1, 12):
+        datos[f'Q15_{i}'] = _columna(semilla, f'Q15_{i}', ESCALA_ACUERDO, filas, nulos=0.05)
+    for i in range(1, 14):
+        datos[f'Q16_{i}'] = _columna(semilla, f'Q16_{i}', ESCALA_ACUERDO, filas, nulos=0.05)
+    for i in range(1, 11):
+        datos[f'Q18_{i}'] = _columna(semilla, f'Q18_{i}', ESCALA_FRECUENCIA, filas, nulos=0.05)
+    for pregunta in ('Q19', 'Q20', 'Q43'):
+        for i in range(1, 8):
+            datos[f'{pregunta}_{i}'] = _columna(semilla, f'{pregunta}_{i}', escala_0_10 + RESPUESTAS_NO_SABE, filas, nulos=0.05)
+    for i in range(1, 7):
+        datos[f'Q22_{i}'] = _columna(semilla, f'Q22_{i}', ['Sí', 'No'], filas)
+    datos['Q26'] = _columna(semilla, 'Q26', ['Primaria', 'Secundaria', 'Media'], filas)
+    datos['Q27'] = _columna(semilla, 'Q27', ['Sí', 'No'], filas)
+    datos['Q36'] = _columna(semilla, 'Q36', ['Sí', 'No'], filas, nulos=0.3)
+    for i in range(1, 12):
+        datos[f'Q37_{i}'] = _columna(semilla, f'Q37_{i}', ['Sí'], filas, nulos=0.6)
+    datos['Q38'] = _columna(semilla, 'Q38', list(range(0, 41)), filas, nulos=0.3)
+    datos['Q39'] = _columna(semilla, 'Q39', list(range(0, 41)), filas, nulos=0.3)
+    datos['Nodo'] = _columna(semilla, 'Nodo', [f'Nodo {i}' for i in range(1, 41)], filas)
+    return pd.DataFrame(datos)
+
+
+def _encuentros_momentos(filas, semilla):
+    # Algunas conductas llevan espacios sobrantes, como en la hoja real
+    conductas = CONDUCTAS_PERMITIDAS + [f'{CONDUCTAS_PERMITIDAS[0]} ', 'Otra conducta']
+    return pd.DataFrame({
+        'Fase': _columna(semilla, 'Fase', FASES, filas),
+        'Encuentro': _columna(semilla, 'Encuentro', ENCUENTROS, filas),
+        'Número de momento': _columna(semilla, 'Número de momento', [1, 2, 3, 4], filas),
+        'participante': _columna(semilla, 'participante', PARTICIPANTES, filas),
+        'Conducta': _columna(semilla, 'Conducta', conductas, filas),
+        'tipo': _columna(semilla, 'tipo', TIPOS_CONDUCTA, filas),
+    })
+
+
+def _encuentros_genero(filas, semilla):
+    df = _encuentros_momentos(filas, semilla)
+    df['sexo'] = _columna(semilla, 'sexo', ['femenino', 'masculino', 'Femenino '], filas)
+    df['nombre'] = _columna(semilla, 'nombre', [f'Participante {i}' for i in range(1, 201)], filas)
+    return df
+
+
+def _encuentros_respuestas(filas, semilla):
+    return pd.DataFrame({
+        'Fase': _columna(semilla, 'Fase', FASES, filas),
+        'Encuentro': _columna(semilla, 'Encuentro', ENCUENTROS, filas),
+        'pregunta': _columna(semilla, 'pregunta', PREGUNTAS_ABIERTAS, filas),
+        'respuesta': _columna(semilla, 'respuesta', RESPUESTAS_ABIERTAS, filas),
+    })
+
+
+def _nodos(filas, semilla):
+    return pd.DataFrame({
+        'Nodo': [f'Nodo {i + 1}' for i in range(filas)],
+        'Departamento': _columna(semilla, 'Departamento', DEPARTAMENTOS, filas),
+        'Cédula Mentor': _columna(semilla, 'Cédula Mentor', list(range(1000000, 1000000 + max(filas // 5, 1))), filas),
+    })
+
+
+def _marco_calidad(filas, semilla):
+    # Dos filas por institución: Pretest y Posttest
+    datos = {
+        'Código IE': [f'IE{i // 2 + 1:04d}' for i in range(filas)],
+        'Momento': ['Pretest' if i % 2 == 0 else 'Posttest' for i in range(filas)],
+    }
+    for dimension in DIMENSIONES_MARCO:
+        datos[dimension] = _columna(semilla, dimension, list(MAPPING), filas)
+    return pd.DataFrame(datos)
+
+
+# Nombre del conjunto de datos -> función (filas, semilla) que genera un DataFrame realista
+GENERADORES = {
+    "pares": _pares,
+    "encuentros_momentos": _encuentros_momentos,
+    "encuentros_genero": _encuentros_genero,
+    "encuentros_respuestas": _encuentros_respuestas,
+    "nodos_componente_2": _nodos,
+    "nodos_componente_3": lambda filas, semilla: _nodos(filas, semilla + 1),
+    "marco_calidad": _marco_calidad,
+}
+
+
+@functools.lru_cache(maxsize=32)
+def generar_csv(nombre, filas=FIXTURES_FILAS, semilla=FIXTURES_SEMILLA):
+    """Contenido CSV (bytes) del conjunto de datos `nombre` con `filas` filas."""
+    return GENERADORES[nombre](filas, semilla).to_csv(index=False).encode("utf-8")
+
+
+def escribir_fixtures(directorio, filas=FIXTURES_FILAS, semilla=FIXTURES_SEMILLA):
+    """Escribe <nombre>.csv de cada conjunto en `directorio` (para CODINGHUBS_FIXTURES_DIR)."""
+    os.makedirs(directorio, exist_ok=True)
+    for nombre in GENERADORES:
+        with open(os.path.join(directorio, f"{nombre}.csv"), "wb") as archivo:
+            archivo.write(generar_csv(nombre, filas, semilla))
+
+
+def _manejador(filas, latencia, semilla, directorio):
+    class Manejador(BaseHTTPRequestHandler):
+        def do_GET(self):
+            ruta = urlparse(self.path)
+            parametros = {clave: valores[-1] for clave, valores in parse_qs(ruta.query).items()}
+            nombre = os.path.basename(ruta.path)
+            nombre = nombre[:-4] if nombre.endswith(".csv") else nombre
+            try:
+                n_filas = int(parametros.get("filas", filas))
+                espera = float(parametros.get("latencia", latencia))
+                n_semilla = int(parametros.get("semilla", semilla))
+            except ValueError:
+                self.send_error(400, "Parámetros inválidos")
+                return
+
+            archivo = directorio and os.path.join(directorio, f"{nombre}.csv")
+            if archivo and os.path.exists(archivo):
+                with open(archivo, "rb") as f:
+                    contenido = f.read()
+            elif nombre in GENERADORES:
+                contenido = generar_csv(nombre, n_filas, n_semilla)
+            else:
+                self.send_error(404, f"Conjunto de datos desconocido: {nombre}")
+                return
+
+            time.sleep(espera)
+            self.send_response(200)
+            self.send_header("Content-Type", "text/csv; charset=utf-8")
+            self.send_header("Content-Length", str(len(contenido)))
+            self.end_headers()
+            self.wfile.write(contenido)
+
+        def log_message(self, formato, *args):
+            pass
+
+    return Manejador
+
+
+def iniciar_servidor(puerto=FIXTURES_PUERTO, filas=FIXTURES_FILAS, latencia=FIXTURES_LATENCIA,
+                     semilla=FIXTURES_SEMILLA, directorio=None):
+    """
+    Arranca el servidor en un hilo de fondo y lo devuelve (usar `servidor.shutdown()` para detenerlo).
+    Si `directorio` contiene <nombre>.csv, se sirve ese archivo en lugar del generado.
+    """
+    servidor = ThreadingHTTPServer(("127.0.0.1", puerto), _manejador(filas, latencia, semilla, directorio))
+    servidor.daemon_threads = True
+    threading.Thread(target=servidor.serve_forever, name="servidor-fixtures", daemon=True).start()
+    return servidor
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Servidor local de hojas de prueba para el modo sin conexión.")
+    parser.add_argument("--puerto", type=int, default=FIXTURES_PUERTO)
+    parser.add_argument("--filas", type=int, default=FIXTURES_FILAS, help="Filas por hoja generada")
+    parser.add_argument("--latencia", type=float, default=FIXTURES_LATENCIA, help="Espera (segundos) antes de cada respuesta")
+    parser.add_argument("--semilla", type=int, default=FIXTURES_SEMILLA)
+    parser.add_argument("--directorio", help="Carpeta con <nombre>.csv a servir en lugar de los datos generados")
+    parser.add_argument("--escribir", metavar="DIRECTORIO", help="Solo escribe los CSV generados en DIRECTORIO y termina")
+    args = parser.parse_args()
+
+    if args.escribir:
+        escribir_fixtures(args.escribir, args.filas, args.semilla)
+        print(f"Datos de prueba escritos en {args.escribir}")
+        return
+
+    servidor = iniciar_servidor(args.puerto, args.filas, args.latencia, args.semilla, args.directorio)
+    print(f"Sirviendo datos de prueba en http://127.0.0.1:{args.puerto}/<nombre>.csv ({', '.join(GENERADORES)})")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        servidor.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.sheet_refresher import obtener_datos, suscribir, version_actual
+
+# Estado de ingesta por URL: última versión procesada, sus huellas y sus agregados
+_estados = {}
+_lock = threading.Lock()
+
+
+def huellas_filas(df):
+    """Huella (hash de 64 bits) del contenido de cada fila, sin tener en cuenta el índice."""
+    if df.empty:
+        return np.empty(0, dtype=np.uint64)
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+
+def _filas_sobrantes(huellas, huellas_referencia):
+    """
+    Máscara de las filas cuya huella aparece más veces que en la referencia
+    (multiconjunto: las filas repetidas se cuentan una a una).
+    """
+    ocurrencia = pd.Series(huellas).groupby(huellas).cumcount().to_numpy()
+    conteo_ref = pd.Series(huellas_referencia).value_counts()
+    disponibles = pd.Series(huellas).map(conteo_ref).fillna(0).to_numpy()
+    return ocurrencia >= disponibles
+
+
+def detectar_delta(df_anterior, huellas_anteriores, df_nuevo, huellas_nuevas):
+    """
+    Devuelve (agregadas, eliminadas): las filas nuevas o editadas del DataFrame nuevo
+    y las filas del anterior que desaparecieron o fueron editadas.
+    Una fila editada cuenta como eliminada en su versión vieja y agregada en la nueva.
+    """
+    agregadas = df_nuevo[_filas_sobrantes(huellas_nuevas, huellas_anteriores)]
+    eliminadas = df_anterior[_filas_sobrantes(huellas_anteriores, huellas_nuevas)]
+    return agregadas, eliminadas
+
+
+class AgregadoBloques:
+    """
+    Suma, suma de cuadrados y número de casos completos de cada bloque de preguntas.
+    Al ser aditivos, se actualizan sumando las filas nuevas y restando las eliminadas.
+    `codificar(df)` devuelve la matriz de puntajes (MatrizLikert) de las filas recibidas.
+    """
+
+    def __init__(self, bloques, codificar):
+        self.bloques = bloques
+        self.codificar = codificar
+        self.n = {bloque: 0 for bloque in bloques}
+        self.suma = {bloque: np.zeros(len(cols)) for bloque, cols in bloques.items()}
+        self.suma_cuadrados = {bloque: np.zeros(len(cols)) for bloque, cols in bloques.items()}
+
+    def aplicar(self, df, signo):
+        if df.empty:
+            return
+        matriz = self.codificar(df)
+        for bloque, cols in self.bloques.items():
+            if not matriz.contiene(cols):
+                continue
+            completos = matriz.bloque(cols)[matriz.completos(cols)].astype(np.float64)
+            self.n[bloque] += signo * len(completos)
+            self.suma[bloque] += signo * completos.sum(axis=0)
+            self.suma_cuadrados[bloque] += signo * (completos ** 2).sum(axis=0)
+
+    def resumen(self, bloque):
+        """Devuelve (n, promedios, desviaciones estándar) del bloque, o (0, None, None) si no hay datos."""
+        n = self.n[bloque]
+        if n == 0:
+            return 0, None, None
+        cols = self.bloques[bloque]
+        promedios = self.suma[bloque] / n
+        if n > 1:
+            varianza = (self.suma_cuadrados[bloque] - n * promedios ** 2) / (n - 1)
+            desviaciones = np.sqrt(np.clip(varianza, 0, None))
+        else:
+            desviaciones = np.full(len(cols), np.nan)
+        return n, pd.Series(promedios, index=cols), pd.Series(desviaciones, index=cols)
+
+
+class ConteoClaves:
+    """
+    Multiconjunto de las claves (combinaciones de columnas) de las filas que pasan
+    un filtro. Sirve para contar claves distintas (equivalente a drop_duplicates)
+    actualizando solo con las filas que cambian.
+    """
+
+    def __init__(self, columnas, filtrar=None):
+        self.columnas = columnas
+        self.filtrar = filtrar
+        self.conteo = pd.DataFrame(columns=columnas + ['_n'])
+
+    def aplicar(self, df, signo):
+        if df.empty or any(col not in df.columns for col in self.columnas):
+            return
+        if self.filtrar is not None:
+            df = self.filtrar(df)
+        delta = df.groupby(self.columnas, dropna=False).size().reset_index(name='_n')
+        delta['_n'] *= signo
+        conteo = pd.concat([self.conteo, delta], ignore_index=True) if len(self.conteo) else delta
+        conteo = conteo.groupby(self.columnas, dropna=False, sort=False)['_n'].sum().reset_index()
+        self.conteo = conteo[conteo['_n'] > 0].reset_index(drop=True)
+
+    def claves(self):
+        """Claves distintas presentes actualmente (sin la columna de multiplicidad)."""
+        return self.conteo[self.columnas]
+
+
+def registrar_agregado(url, nombre, fabrica):
+    """
+    Declara un agregado incremental sobre la fuente `url`. `fabrica()` crea el
+    agregado vacío (con método aplicar(df, signo)); se actualiza en segundo plano
+    cada vez que el refrescador trae una versión nueva.
+    """
+    with _lock:
+        estado = _estados.get(url)
+        if estado is None:
+            estado = {"version": None, "df": None, "huellas": None, "fabricas": {}, "agregados": {}, "lock": threading.Lock()}
+            _estados[url] = estado
+            suscribir(url, lambda df, version: ingerir(url, df, version))
+        if nombre in estado["fabricas"]:
+            return
+        estado["fabricas"][nombre] = fabrica
+    # Un agregado nuevo obliga a reconstruir desde cero en la próxima ingesta
+    with estado["lock"]:
+        estado["version"] = None
+
+
+def ingerir(url, df, version):
+    """Actualiza los agregados de la fuente aplicando solo las filas agregadas, editadas o eliminadas."""
+    estado = _estados.get(url)
+    if estado is None:
+        return
+    with estado["lock"]:
+        if estado["version"] == version:
+            return
+        huellas = huellas_filas(df)
+        if estado["version"] is None or list(estado["df"].columns) != list(df.columns):
+            # Primera ingesta, agregado nuevo o cambio de columnas: se procesa todo
+            estado["agregados"] = {nombre: fabrica() for nombre, fabrica in estado["fabricas"].items()}
+            agregadas, eliminadas = df, df.iloc[0:0]
+        else:
+            agregadas, eliminadas = detectar_delta(estado["df"], estado["huellas"], df, huellas)
+        for agregado in estado["agregados"].values():
+            agregado.aplicar(eliminadas, -1)
+            agregado.aplicar(agregadas, +1)
+        estado.update({"version": version, "df": df, "huellas": huellas})
+
+
+def obtener_agregado(url, nombre):
+    """Devuelve el agregado `nombre` de la fuente, al día con la versión en memoria."""
+    estado = _estados[url]
+    version = version_actual(url)
+    if version is None or estado["version"] != version:
+        df = obtener_datos(url)
+        ingerir(url, df, version_actual(url))
+    return estado["agregados"][nombre]
+
+
+def leer_agregado(url, nombre, version, leer):
+    """
+    Devuelve `leer(agregado)` si el agregado de la fuente está en la versión `version`
+    de los datos, o None si corresponde a otra (p. ej. el refrescador trajo una nueva a
+    mitad de una recarga). La lectura se hace con el agregado bloqueado.
+    """
+    obtener_agregado(url, nombre)
+    estado = _estados[url]
+    with estado["lock"]:
+        if version is None or estado["version"] != version:
+            return None
+        return leer(estado["agregados"][nombre])
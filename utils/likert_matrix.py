@@ -0,0 +1,97 @@
+import numpy as np
+import pandas as pd
+
+from constants.schema_constants import BLOQUES_PARES, ESQUEMA_PARES, PREGUNTAS_INVERSAS
+from utils.schema import aplicar_esquema, regla_columna
+from utils.version_cache import registrar_derivado, obtener_derivado
+
+# Tipos del esquema que se codifican como puntajes numéricos
+TIPOS_PUNTAJE = ('likert', 'escala')
+
+
+class MatrizLikert:
+    """
+    Todas las preguntas Likert, de frecuencia y de 0 a 10 codificadas en una sola pasada:
+    `codigos` (int8, 0 = sin respuesta), `faltantes` (máscara de nulos) y `valores`
+    (float32 con NaN). Las matrices se guardan por columnas (orden Fortran) y cada bloque
+    de BLOQUES_PARES ocupa columnas consecutivas, así que leer un bloque no copia datos.
+    Las preguntas redactadas en negativo ya vienen invertidas (6 - valor).
+    """
+
+    def __init__(self, columnas, codigos, faltantes, index):
+        self.columnas = columnas
+        self.posiciones = {col: j for j, col in enumerate(columnas)}
+        self.codigos = codigos
+        self.faltantes = faltantes
+        self.index = index
+        self.valores = codigos.astype(np.float32, order='F')
+        self.valores[faltantes] = np.nan
+
+    def _indices(self, cols):
+        posiciones = [self.posiciones[col] for col in cols]
+        if posiciones and posiciones == list(range(posiciones[0], posiciones[0] + len(posiciones))):
+            return slice(posiciones[0], posiciones[-1] + 1)
+        return posiciones
+
+    def contiene(self, cols):
+        return all(col in self.posiciones for col in cols)
+
+    def bloque(self, cols):
+        """Valores float32 (NaN = sin respuesta) de las columnas indicadas, una fila por respuesta."""
+        return self.valores[:, self._indices(cols)]
+
+    def mascara(self, cols):
+        """Máscara de respuestas faltantes de las columnas indicadas."""
+        return self.faltantes[:, self._indices(cols)]
+
+    def completos(self, cols):
+        """Filas que respondieron todas las columnas indicadas."""
+        return ~self.mascara(cols).any(axis=1)
+
+    def como_dataframe(self, cols):
+        """El bloque como DataFrame (float64, NaN = sin respuesta) para los gráficos que lo necesitan."""
+        return pd.DataFrame(self.bloque(cols).astype(np.float64), index=self.index, columns=cols)
+
+
+def _columnas_puntaje(df, esquema):
+    """Columnas de puntaje del DataFrame: primero las de cada bloque, en orden, y luego el resto."""
+    presentes = [col for col in df.columns if regla_columna(col, esquema)[0] in TIPOS_PUNTAJE]
+    ordenadas = [col for cols in BLOQUES_PARES.values() for col in cols if col in presentes]
+    return ordenadas + [col for col in presentes if col not in ordenadas]
+
+
+def codificar_matriz(df, esquema=ESQUEMA_PARES, invertir=PREGUNTAS_INVERSAS):
+    """Codifica en una sola matriz todas las columnas de puntaje (Likert y escalas 0-10) del DataFrame."""
+    df = aplicar_esquema(df, esquema)
+    columnas = _columnas_puntaje(df, esquema)
+    codigos = np.zeros((len(df), len(columnas)), dtype=np.int8, order='F')
+    faltantes = np.zeros((len(df), len(columnas)), dtype=bool, order='F')
+    for j, col in enumerate(columnas):
+        serie = df[col]
+        if isinstance(serie.dtype, pd.CategoricalDtype):
+            codigos[:, j] = serie.cat.codes.to_numpy() + 1
+            faltantes[:, j] = codigos[:, j] == 0
+        else:
+            faltantes[:, j] = serie.isna().to_numpy()
+            codigos[:, j] = serie.to_numpy(dtype=np.int8, na_value=0)
+        if col in invertir:
+            codigos[:, j] = np.where(faltantes[:, j], 0, 6 - codigos[:, j])
+    return MatrizLikert(columnas, codigos, faltantes, df.index)
+
+
+def matriz_likert(df):
+    """Matriz de puntajes del DataFrame, codificada una sola vez por versión de los datos."""
+    return obtener_derivado("matriz_likert", df)
+
+
+def bloque_numerico(df, bloque):
+    """
+    Puntajes de un bloque de BLOQUES_PARES como DataFrame (float64, NaN = sin respuesta),
+    compartido por todos los tableros que lo usan. No debe modificarse en sitio.
+    """
+    return obtener_derivado(f"{bloque} numérico", df)
+
+
+registrar_derivado("matriz_likert", codificar_matriz)
+for _bloque, _cols in BLOQUES_PARES.items():
+    registrar_derivado(f"{_bloque} numérico", lambda df, matriz, cols=_cols: matriz.como_dataframe(cols), "matriz_likert")
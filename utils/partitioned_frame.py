@@ -0,0 +1,27 @@
+import numpy as np
+import pandas as pd
+
+
+class ParticionFrame:
+    """
+    Un DataFrame ordenado una sola vez por los valores de una columna (estable: cada
+    parte conserva el orden original) con los límites de cada parte. Pedir una parte
+    es una búsqueda en un diccionario y devuelve una vista por posiciones, sin copiar.
+    """
+
+    def __init__(self, df, columna):
+        self.columna = columna
+        self.completo = df.copy(deep=False)
+        codigos, valores = pd.factorize(df[columna], sort=True)
+        orden = np.argsort(codigos, kind='stable')
+        self.ordenado = df.take(orden)
+        limites = np.searchsorted(codigos[orden], np.arange(len(valores) + 1))
+        self.claves = list(valores)
+        self.limites = {clave: (int(limites[i]), int(limites[i + 1])) for i, clave in enumerate(self.claves)}
+
+    def vista(self, clave=None):
+        """Filas con `columna == clave` (todas las filas si clave es None; vacío si no existe)."""
+        if clave is None:
+            return self.completo.copy(deep=False)
+        inicio, fin = self.limites.get(clave, (0, 0))
+        return self.ordenado.iloc[inicio:fin]
@@ -0,0 +1,98 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+from constants.schema_constants import RESPUESTAS_NO_SABE, VALORES_SI_NO
+
+
+def _entero_compacto(serie):
+    """Convierte una serie numérica al entero con nulos más pequeño que la contiene."""
+    valores = serie.dropna()
+    if valores.empty:
+        return serie.astype('Int8')
+    if not np.all(np.mod(valores, 1) == 0):
+        return serie.astype('float32')
+    minimo, maximo = valores.min(), valores.max()
+    for tipo, info in (('Int8', np.iinfo(np.int8)), ('Int16', np.iinfo(np.int16)), ('Int32', np.iinfo(np.int32))):
+        if info.min <= minimo and maximo <= info.max:
+            return serie.astype(tipo)
+    return serie.astype('Int64')
+
+
+def _a_likert(serie, escala):
+    tipo = pd.CategoricalDtype(escala, ordered=True)
+    if serie.dtype == tipo:
+        return serie
+    return serie.astype('string').str.strip().astype(tipo)
+
+
+def _a_escala(serie):
+    if pd.api.types.is_integer_dtype(serie):
+        return serie
+    return _entero_compacto(pd.to_numeric(serie.replace(RESPUESTAS_NO_SABE, 0), errors='coerce'))
+
+
+def _a_conteo(serie):
+    if pd.api.types.is_integer_dtype(serie):
+        return serie
+    return _entero_compacto(pd.to_numeric(serie, errors='coerce'))
+
+
+def _a_si_no(serie):
+    if serie.dtype == 'boolean':
+        return serie
+    return serie.astype('string').str.strip().map(VALORES_SI_NO).astype('boolean')
+
+
+def _a_categoria(serie):
+    if isinstance(serie.dtype, pd.CategoricalDtype):
+        return serie
+    return serie.astype('category')
+
+
+CONVERSORES = {
+    'likert': _a_likert,
+    'escala': lambda serie, _: _a_escala(serie),
+    'conteo': lambda serie, _: _a_conteo(serie),
+    'si_no': lambda serie, _: _a_si_no(serie),
+    'categoria': lambda serie, _: _a_categoria(serie),
+}
+
+
+def regla_columna(columna, esquema):
+    """Devuelve (tipo, escala) de la primera regla del esquema que coincide con la columna."""
+    for patron, tipo, escala in esquema:
+        if re.fullmatch(patron, str(columna)):
+            return tipo, escala
+    return None, None
+
+
+def aplicar_esquema(df, esquema):
+    """
+    Convierte las columnas declaradas en el esquema a tipos compactos:
+    categóricas ordenadas para Likert, enteros pequeños para escalas y conteos,
+    booleanos para sí/no. Las columnas que ya tienen el tipo correcto no se tocan.
+    """
+    convertidas = {}
+    for col in df.columns:
+        tipo, escala = regla_columna(col, esquema)
+        if tipo is None:
+            continue
+        original = df[col]
+        serie = CONVERSORES[tipo](original, escala)
+        if serie is not original:
+            convertidas[col] = serie
+    if not convertidas:
+        return df
+    df = df.copy(deep=False)
+    for col, serie in convertidas.items():
+        df[col] = serie
+    return df
+
+
+def etiquetas_si_no(serie):
+    """Convierte una columna booleana de sí/no a las etiquetas 'Sí'/'No' para mostrarla."""
+    if serie.dtype != 'boolean':
+        return serie
+    return serie.map({True: 'Sí', False: 'No'})
@@ -0,0 +1,103 @@
+import numpy as np
+import pandas as pd
+
+from constants.schema_constants import ETIQUETA_SIN_RESPUESTA
+from utils.schema import etiquetas_si_no
+
+
+def _niveles(serie):
+    """Códigos y etiquetas de una dimensión; las respuestas vacías forman su propio nivel (al final)."""
+    etiquetas = etiquetas_si_no(serie).astype('string')
+    niveles = sorted(etiquetas.dropna().unique())
+    codigos = pd.Categorical(etiquetas, categories=niveles).codes.astype(np.int64)
+    if (codigos < 0).any():
+        codigos[codigos < 0] = len(niveles)
+        niveles.append(ETIQUETA_SIN_RESPUESTA)
+    return codigos, niveles
+
+
+def _valores_bloque(df, matriz, cols):
+    """(valores float64, filas completas) de un bloque: de la matriz de puntajes o de las columnas."""
+    if matriz is not None and matriz.contiene(cols):
+        return matriz.bloque(cols).astype(np.float64), matriz.completos(cols)
+    valores = np.column_stack([
+        pd.to_numeric(df[col], errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan) for col in cols
+    ])
+    return valores, ~np.isnan(valores).any(axis=1)
+
+
+class CuboSegmentos:
+    """
+    Cubo de agregados por combinación de segmentos (p. ej. género x nivel x formación x nodo).
+    Para cada bloque guarda, por celda, el número de casos completos y la suma y suma de
+    cuadrados de cada pregunta. Consultar un segmento solo suma celdas: no recorre respuestas.
+    """
+
+    def __init__(self, df, dimensiones, bloques, matriz=None):
+        self.dimensiones = [dim for dim in dimensiones if dim in df.columns]
+        self.niveles = {}
+        codigos = []
+        for dim in self.dimensiones:
+            codigos_dim, self.niveles[dim] = _niveles(df[dim])
+            codigos.append(codigos_dim)
+        self.forma = tuple(len(self.niveles[dim]) for dim in self.dimensiones)
+        n_celdas = int(np.prod(self.forma))
+        if codigos:
+            self.celda = np.ravel_multi_index(codigos, self.forma)
+        else:
+            self.celda = np.zeros(len(df), dtype=np.int64)
+        self.filas = np.bincount(self.celda, minlength=n_celdas)
+
+        self.columnas, self.n, self.suma, self.suma_cuadrados = {}, {}, {}, {}
+        for bloque, cols in bloques.items():
+            if any(col not in df.columns for col in cols):
+                continue
+            valores, completos = _valores_bloque(df, matriz, cols)
+            celdas, valores = self.celda[completos], valores[completos]
+            self.columnas[bloque] = cols
+            self.n[bloque] = np.bincount(celdas, minlength=n_celdas)
+            self.suma[bloque] = np.column_stack([
+                np.bincount(celdas, weights=valores[:, j], minlength=n_celdas) for j in range(len(cols))
+            ])
+            self.suma_cuadrados[bloque] = np.column_stack([
+                np.bincount(celdas, weights=valores[:, j] ** 2, minlength=n_celdas) for j in range(len(cols))
+            ])
+
+    def seleccion(self, segmento=None):
+        """
+        Máscara de las celdas incluidas en `segmento` ({dimensión: [niveles]}).
+        Una dimensión ausente o con lista vacía incluye todos sus niveles.
+        """
+        mascara = np.ones(self.forma, dtype=bool)
+        for eje, dim in enumerate(self.dimensiones):
+            elegidos = (segmento or {}).get(dim)
+            if elegidos:
+                forma = [1] * len(self.forma)
+                forma[eje] = -1
+                mascara &= np.isin(self.niveles[dim], elegidos).reshape(forma)
+        return mascara.ravel()
+
+    def filas_segmento(self, segmento=None):
+        """Máscara de las respuestas (filas del DataFrame original) que pertenecen al segmento."""
+        return self.seleccion(segmento)[self.celda]
+
+    def total(self, segmento=None):
+        """Número de respuestas del segmento."""
+        return int(self.filas[self.seleccion(segmento)].sum())
+
+    def resumen(self, bloque, segmento=None):
+        """Devuelve (n, promedios, desviaciones estándar) del bloque en el segmento, o (0, None, None)."""
+        if bloque not in self.n:
+            return 0, None, None
+        celdas = self.seleccion(segmento)
+        n = int(self.n[bloque][celdas].sum())
+        if n == 0:
+            return 0, None, None
+        cols = self.columnas[bloque]
+        promedios = self.suma[bloque][celdas].sum(axis=0) / n
+        if n > 1:
+            varianza = (self.suma_cuadrados[bloque][celdas].sum(axis=0) - n * promedios ** 2) / (n - 1)
+            desviaciones = np.sqrt(np.clip(varianza, 0, None))
+        else:
+            desviaciones = np.full(len(cols), np.nan)
+        return n, pd.Series(promedios, index=cols), pd.Series(desviaciones, index=cols)
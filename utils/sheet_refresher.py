@@ -0,0 +1,193 @@
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from constants.data_constants import INTERVALO_REFRESCO, MAX_DESCARGAS_SIMULTANEAS
+from utils.snapshot_store import leer_snapshot, refrescar_fuente
+
+# Funciones de lectura y preparación registradas para cada URL
+_fuentes = {}
+# Último dato bueno de cada URL, compartido por todas las sesiones (solo lectura):
+# {url: {"df": ..., "version": ..., "actualizado": ...}}
+_datos = {}
+# Descargas en curso: una sola por URL (single-flight)
+_en_vuelo = {}
+# Funciones a llamar cuando una URL recibe una versión nueva: {url: [funcion(df, version)]}
+_suscriptores = {}
+
+_lock = threading.Lock()
+_executor = ThreadPoolExecutor(max_workers=MAX_DESCARGAS_SIMULTANEAS, thread_name_prefix="refresco")
+_planificador = None
+
+logger = logging.getLogger(__name__)
+
+
+def registrar_fuente(url, leer_csv=pd.read_csv, preparar=None, lector=None):
+    """
+    Registra una hoja publicada para que el refrescador la mantenga al día.
+    `leer_csv` recibe el contenido descargado y devuelve el DataFrame.
+    `preparar` (opcional) se aplica tanto a lo descargado como a lo leído de disco,
+    por lo que debe ser idempotente (p. ej. aplicar el esquema de tipos).
+    `lector` (opcional) identifica la versión de `leer_csv` (columnas y esquema): las
+    instantáneas guardadas con otra no se reutilizan.
+    Solo registra: los refrescos periódicos empiezan con iniciar_refrescador().
+    """
+    with _lock:
+        _fuentes[url] = {"leer": leer_csv, "preparar": preparar, "lector": lector}
+
+
+def _preparar(url, df):
+    preparar = _fuentes[url]["preparar"]
+    return df if preparar is None else preparar(df)
+
+
+def _leer_y_preparar(url):
+    leer_csv = _fuentes[url]["leer"]
+    return lambda contenido: _preparar(url, leer_csv(contenido))
+
+
+def suscribir(url, funcion):
+    """Llama a `funcion(df, version)` cada vez que la fuente recibe una versión nueva."""
+    with _lock:
+        _suscriptores.setdefault(url, []).append(funcion)
+
+
+def _compartir(df, version):
+    """
+    Prepara un DataFrame para compartirlo entre sesiones sin copiarlo: anota su
+    versión en attrs y marca como solo lectura los arreglos NumPy de sus columnas,
+    de modo que una escritura en el lugar falle en vez de alterar los datos de todos.
+    Las columnas de texto ya viven en Arrow, que es inmutable.
+    """
+    df.attrs["version"] = version
+    for i, tipo in enumerate(df.dtypes):
+        if not isinstance(tipo, np.dtype):
+            continue
+        # to_numpy devuelve una vista de solo lectura; la columna pasa a apoyarse en ella
+        arreglo = df.iloc[:, i].to_numpy()
+        if arreglo.flags.writeable:
+            arreglo = arreglo.view()
+            arreglo.flags.writeable = False
+        df.isetitem(i, pd.Series(arreglo, index=df.index, copy=False))
+    return df
+
+
+def _vista(df):
+    """
+    Vista superficial del DataFrame compartido. Con copy-on-write no copia datos,
+    pero asignar, borrar o renombrar columnas en ella no afecta al compartido.
+    """
+    return df.copy(deep=False)
+
+
+def _guardar_en_memoria(url, df, version):
+    df = _compartir(df, version)
+    with _lock:
+        anterior = _datos.get(url)
+        _datos[url] = {"df": df, "version": version, "actualizado": time.time()}
+        suscriptores = list(_suscriptores.get(url, []))
+    if anterior is not None and anterior["version"] == version:
+        return
+    for funcion in suscriptores:
+        try:
+            funcion(df, version)
+        except Exception as e:
+            logger.exception("Error al procesar la versión %s de %s: %s", version, url, e)
+
+
+def _descargar(url):
+    anterior = _datos.get(url)
+    df, version = refrescar_fuente(
+        url, _leer_y_preparar(url), version_conocida=anterior and anterior["version"], lector=_fuentes[url]["lector"]
+    )
+    if df is None:
+        # Sin cambios: se conserva el mismo objeto para no invalidar lo derivado de él
+        df = anterior["df"]
+    else:
+        df = _preparar(url, df)
+    _guardar_en_memoria(url, df, version)
+    return df, version
+
+
+def refrescar(url):
+    """
+    Programa una descarga de la fuente y devuelve su Future. Si ya hay una
+    descarga en curso para la misma URL, devuelve esa misma (single-flight).
+    """
+    with _lock:
+        futuro = _en_vuelo.get(url)
+        if futuro is not None:
+            return futuro
+        futuro = _executor.submit(_descargar, url)
+        _en_vuelo[url] = futuro
+
+    def liberar(f):
+        with _lock:
+            if _en_vuelo.get(url) is f:
+                del _en_vuelo[url]
+        if f.exception() is not None:
+            logger.warning("No se pudo refrescar %s: %s", url, f.exception())
+
+    futuro.add_done_callback(liberar)
+    return futuro
+
+
+def obtener_datos(url, leer_csv=pd.read_csv):
+    """
+    Devuelve el último DataFrame disponible de la fuente sin esperar a la red.
+    Solo bloquea en el primer arranque, cuando no existe ni copia en memoria
+    ni instantánea en disco; aun así, las sesiones simultáneas comparten una descarga.
+    Todas las sesiones reciben vistas del mismo DataFrame de solo lectura, sin copias.
+    """
+    if url not in _fuentes:
+        registrar_fuente(url, leer_csv)
+
+    dato = _datos.get(url)
+    if dato is not None:
+        return _vista(dato["df"])
+
+    df, meta = leer_snapshot(url, _fuentes[url]["lector"])
+    if df is not None:
+        df = _preparar(url, df)
+        _guardar_en_memoria(url, df, meta["version"])
+        refrescar(url)
+        return _vista(df)
+
+    df, _ = refrescar(url).result()
+    return _vista(df)
+
+
+def version_actual(url):
+    """Versión (hash del contenido) del dato en memoria, o None si aún no se ha cargado."""
+    dato = _datos.get(url)
+    return dato["version"] if dato else None
+
+
+def _ciclo_planificador():
+    """Refresca periódicamente cada fuente registrada cuyo dato ya caducó."""
+    while True:
+        ahora = time.time()
+        with _lock:
+            urls = list(_fuentes)
+        for url in urls:
+            dato = _datos.get(url)
+            if dato is None or ahora - dato["actualizado"] >= INTERVALO_REFRESCO:
+                refrescar(url)
+        time.sleep(min(60, INTERVALO_REFRESCO))
+
+
+def iniciar_refrescador():
+    """
+    Arranca (una sola vez por proceso) el hilo que refresca en segundo plano las fuentes
+    registradas. Lo llama la aplicación al iniciar; importar los módulos no descarga nada.
+    """
+    global _planificador
+    with _lock:
+        if _planificador is not None:
+            return
+        _planificador = threading.Thread(target=_ciclo_planificador, name="planificador-refresco", daemon=True)
+        _planificador.start()
@@ -0,0 +1,152 @@
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import time
+import urllib.request
+
+import pandas as pd
+
+from constants.data_constants import MAX_DESCARGA_EN_MEMORIA, SNAPSHOT_DIR, SNAPSHOT_MAX_VERSIONES, TIMEOUT_DESCARGA
+
+
+def _carpeta_fuente(url):
+    """Carpeta de instantáneas de una fuente, identificada por el hash de su URL."""
+    clave = hashlib.sha1(url.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(SNAPSHOT_DIR, clave)
+
+
+def _ruta_manifiesto(url):
+    return os.path.join(_carpeta_fuente(url), "manifest.json")
+
+
+def leer_manifiesto(url):
+    """Lee el manifiesto de versiones de una fuente. Devuelve None si no existe."""
+    try:
+        with open(_ruta_manifiesto(url), "r", encoding="utf-8") as archivo:
+            return json.load(archivo)
+    except (OSError, ValueError):
+        return None
+
+
+def _escribir_atomico(ruta, escribir):
+    """Escribe en un archivo temporal y lo renombra, para no dejar archivos a medias."""
+    temporal = f"{ruta}.{os.getpid()}.{threading.get_ident()}.tmp"
+    escribir(temporal)
+    os.replace(temporal, ruta)
+
+
+def _escribir_manifiesto(url, manifiesto):
+    def escribir(ruta):
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            json.dump(manifiesto, archivo, ensure_ascii=False, indent=2)
+    _escribir_atomico(_ruta_manifiesto(url), escribir)
+
+
+def _normalizar_para_parquet(df):
+    """Convierte a texto las columnas de tipo object con valores mixtos que Arrow no acepta."""
+    df = df.copy()
+    for col in df.columns:
+        if df[col].dtype == object:
+            df[col] = df[col].map(lambda valor: valor if pd.isna(valor) else str(valor))
+    return df
+
+
+def descargar_csv(url):
+    """
+    Descarga el contenido crudo de un CSV publicado por partes y devuelve (archivo, version).
+    El archivo temporal vive en memoria mientras es pequeño y pasa a disco si crece;
+    la versión es el hash del contenido, calculado mientras se descarga.
+    """
+    archivo = tempfile.SpooledTemporaryFile(max_size=MAX_DESCARGA_EN_MEMORIA)
+    sha1 = hashlib.sha1()
+    with urllib.request.urlopen(url, timeout=TIMEOUT_DESCARGA) as respuesta:
+        for bloque in iter(lambda: respuesta.read(1 << 20), b""):
+            sha1.update(bloque)
+            archivo.write(bloque)
+    archivo.seek(0)
+    return archivo, sha1.hexdigest()[:16]
+
+
+def guardar_snapshot(url, df, version, lector=None):
+    """
+    Guarda un DataFrame como instantánea Parquet versionada de la fuente `url`
+    y conserva solo las últimas SNAPSHOT_MAX_VERSIONES versiones. `lector` es la huella
+    de la función de lectura que produjo el DataFrame (columnas y esquema).
+    """
+    carpeta = _carpeta_fuente(url)
+    os.makedirs(carpeta, exist_ok=True)
+    archivo = f"{version}.parquet"
+    ruta = os.path.join(carpeta, archivo)
+
+    def escribir(destino):
+        try:
+            df.to_parquet(destino, index=False)
+        except (TypeError, ValueError):
+            # pyarrow lanza ArrowTypeError/ArrowInvalid (subclases de estas) con columnas mixtas
+            _normalizar_para_parquet(df).to_parquet(destino, index=False)
+
+    if not os.path.exists(ruta):
+        _escribir_atomico(ruta, escribir)
+
+    manifiesto = leer_manifiesto(url) or {"url": url, "versiones": []}
+    ahora = time.time()
+    versiones = [v for v in manifiesto["versiones"] if v["version"] != version]
+    versiones.append({"version": version, "archivo": archivo, "creado": ahora, "filas": len(df), "lector": lector})
+    sobrantes, versiones = versiones[:-SNAPSHOT_MAX_VERSIONES], versiones[-SNAPSHOT_MAX_VERSIONES:]
+    manifiesto.update({"versiones": versiones, "actual": version, "verificado": ahora})
+    _escribir_manifiesto(url, manifiesto)
+
+    for sobrante in sobrantes:
+        try:
+            os.remove(os.path.join(carpeta, sobrante["archivo"]))
+        except OSError:
+            pass
+
+
+def leer_snapshot(url, lector=None):
+    """
+    Devuelve (df, metadatos) con la última instantánea válida de la fuente leída con
+    el mismo `lector`, o (None, None) si no hay ninguna en disco. Las instantáneas de
+    otra versión del lector (otras columnas u otro esquema) se ignoran.
+    """
+    manifiesto = leer_manifiesto(url)
+    if not manifiesto:
+        return None, None
+    carpeta = _carpeta_fuente(url)
+    # Se prueba de la más reciente a la más antigua por si algún archivo quedó dañado
+    for meta in reversed(manifiesto["versiones"]):
+        if meta.get("lector") != lector:
+            continue
+        try:
+            return pd.read_parquet(os.path.join(carpeta, meta["archivo"])), meta
+        except (OSError, ValueError):
+            continue
+    return None, None
+
+
+def refrescar_fuente(url, leer_csv, version_conocida=None, lector=None):
+    """
+    Descarga la fuente, la parsea con `leer_csv` y guarda una nueva versión
+    solo si el contenido cambió. Devuelve (df, version); df es None si la
+    versión descargada coincide con `version_conocida`. La versión combina el hash
+    del contenido con la huella del lector, así que cambiar las columnas o el esquema
+    de lectura obliga a parsear de nuevo aunque la hoja no haya cambiado.
+    """
+    archivo, version = descargar_csv(url)
+    if lector is not None:
+        version = f"{version}-{lector}"
+    with archivo:
+        manifiesto = leer_manifiesto(url)
+        if manifiesto and manifiesto.get("actual") == version:
+            df = None
+            if version != version_conocida:
+                df, _ = leer_snapshot(url, lector)
+            if df is not None or version == version_conocida:
+                manifiesto["verificado"] = time.time()
+                _escribir_manifiesto(url, manifiesto)
+                return df, version
+        df = leer_csv(archivo)
+    guardar_snapshot(url, df, version, lector)
+    return df, version
@@ -0,0 +1,63 @@
+import threading
+from collections import OrderedDict
+
+# Resultados derivados de los datos compartidos: {(nombre, version, columnas): (index, valor)},
+# del usado hace más tiempo al más reciente
+_cache = OrderedDict()
+_MAX_ENTRADAS = 32
+_lock = threading.Lock()
+
+
+def por_version(nombre, df, construir):
+    """
+    Devuelve `construir(df)` calculado una sola vez por versión de los datos
+    (df.attrs['version'], que pone el refrescador). Los DataFrames filtrados u ordenados
+    heredan la versión, por eso además se exige el mismo índice; si no coincide se calcula
+    de nuevo y solo se guarda si cubre al menos tantas filas como lo guardado.
+    Al llenarse se descarta la entrada usada hace más tiempo (LRU), así que los
+    resultados que se piden en cada recarga no salen por los de segmentos ocasionales.
+    Sin versión, se calcula cada vez.
+    """
+    version = df.attrs.get("version")
+    if version is None:
+        return construir(df)
+    clave = (nombre, version, tuple(df.columns))
+    with _lock:
+        entrada = _cache.get(clave)
+        if entrada is not None:
+            _cache.move_to_end(clave)
+    if entrada is not None and entrada[0].equals(df.index):
+        return entrada[1]
+    valor = construir(df)
+    if entrada is None or len(df) >= len(entrada[0]):
+        with _lock:
+            _cache[clave] = (df.index, valor)
+            _cache.move_to_end(clave)
+            while len(_cache) > _MAX_ENTRADAS:
+                _cache.popitem(last=False)
+    return valor
+
+
+# Resultados derivados declarados: {nombre: (construir, dependencias)}
+_derivados = {}
+
+
+def registrar_derivado(nombre, construir, *dependencias):
+    """
+    Declara un resultado derivado de los datos: `construir(df, *valores)` recibe, después
+    del DataFrame, el valor de cada dependencia (otros derivados ya registrados, así que
+    el grafo no puede tener ciclos). Registrar de nuevo el mismo nombre lo reemplaza.
+    """
+    faltantes = [dep for dep in dependencias if dep not in _derivados]
+    if faltantes:
+        raise KeyError(f"Dependencias no registradas para {nombre}: {faltantes}")
+    _derivados[nombre] = (construir, dependencias)
+
+
+def obtener_derivado(nombre, df):
+    """
+    Valor del derivado `nombre` para el DataFrame, calculado como mucho una vez por versión
+    de los datos; sus dependencias se resuelven (y se guardan) de la misma forma.
+    """
+    construir, deps = _derivados[nombre]
+    return por_version(nombre, df, lambda df: construir(df, *(obtener_derivado(dep, df) for dep in deps)))